@@ -1,9 +1,9 @@
 # clustering/dissimilarity/combined.py
 
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Tuple
 from master.utils.loader import load_instance
 from master.utils.symmetric_matrix_read import get_symmetric_value
-from master.clustering.dissimilarity.spatial import spatial_dissimilarity
+from master.clustering.dissimilarity.spatial import spatial_dissimilarity, spatial_dissimilarity_to
 from master.clustering.dissimilarity.demand import demand_dissimilarity
 
 
@@ -45,6 +45,34 @@ def combined_dissimilarity(
     return S_sd
 
 
+def combined_dissimilarity_to(
+    instance_name: str,
+    targets: Iterable[int],
+    *,
+    angle_offset: float = 0.0,
+) -> Dict[Tuple[int, int], float]:
+    """
+    S^sd_it for every customer i and each target t only, stored as (i, t).
+    Enough for medoid-based scores (e.g. the silhouette coefficient) and
+    O(N * |targets|) in memory instead of O(N^2) on large instances.
+    """
+    instance = load_instance(instance_name)
+    Q = int(instance["capacity"])
+    demands_arr = instance["demand"]
+
+    S_s = spatial_dissimilarity_to(
+        instance_name,
+        targets,
+        instance,
+        angle_offset=angle_offset,
+    )
+
+    return {
+        (i, t): S_s_it * (1 + (int(demands_arr[i - 1]) + int(demands_arr[t - 1])) / Q)
+        for (i, t), S_s_it in S_s.items()
+    }
+
+
 if __name__ == "__main__":
     S_sd = combined_dissimilarity("X-n101-k25.vrp")
     print("First 3 combined dissimilarities:", list(S_sd.items())[:3])
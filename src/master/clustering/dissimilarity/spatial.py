@@ -1,7 +1,7 @@
 # clustering/dissimilarity/spatial.py
 
 import math
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterable, Tuple, Optional
 from master.utils.loader import load_instance
 from master.clustering.dissimilarity.polar_coordinates import compute_polar_angle
 
@@ -46,22 +46,12 @@ def compute_lambda(coords: Dict[int, Tuple[float, float]]) -> float:
 # --- Main dissimilarity computation -----------------------------------
 # ----------------------------------------------------------------------
 
-def spatial_dissimilarity(
+def _spatial_terms(
     instance_name: str,
-    instance: Optional[dict] = None,
-    *,
-    angle_offset: float = 0.0,
-) -> Dict[Tuple[int, int], float]:
-    """
-    Computes spatial dissimilarity S^s_ij:
-        S^s_ij = sqrt((x_j - x_i)^2 + (y_j - y_i)^2 + λ_eff * (Δθ_ij)^2)
-
-    λ_eff is adapted to depot position via observed angular spread.
-    Only stores (i, j) for i < j for efficiency.
-    """
-    if instance is None:
-        instance = load_instance(instance_name)
-
+    instance: dict,
+    angle_offset: float,
+) -> Tuple[Dict[int, Tuple[float, float]], Dict[int, float], float]:
+    """Customer coords, polar angles and λ_eff shared by all S^s_ij."""
     coords_arr = instance["node_coord"]
     coords_full = {i + 1: tuple(coords_arr[i]) for i in range(len(coords_arr))}
     DEPOT_ID = 1
@@ -86,6 +76,27 @@ def spatial_dissimilarity(
     factor = max(1.0, min(factor, 8.0))    # never reduce λ; optional cap
     lam_eff = lam * factor
 
+    return coords, angles, lam_eff
+
+
+def spatial_dissimilarity(
+    instance_name: str,
+    instance: Optional[dict] = None,
+    *,
+    angle_offset: float = 0.0,
+) -> Dict[Tuple[int, int], float]:
+    """
+    Computes spatial dissimilarity S^s_ij:
+        S^s_ij = sqrt((x_j - x_i)^2 + (y_j - y_i)^2 + λ_eff * (Δθ_ij)^2)
+
+    λ_eff is adapted to depot position via observed angular spread.
+    Only stores (i, j) for i < j for efficiency.
+    """
+    if instance is None:
+        instance = load_instance(instance_name)
+
+    coords, angles, lam_eff = _spatial_terms(instance_name, instance, angle_offset)
+
     # ---- Compute dissimilarities -------------------------------------
     nodes = list(coords.keys())
     S: Dict[Tuple[int, int], float] = {}
@@ -105,6 +116,38 @@ def spatial_dissimilarity(
     return S
 
 
+def spatial_dissimilarity_to(
+    instance_name: str,
+    targets: Iterable[int],
+    instance: Optional[dict] = None,
+    *,
+    angle_offset: float = 0.0,
+) -> Dict[Tuple[int, int], float]:
+    """
+    S^s_it for every customer i and each target t only, stored as (i, t):
+    O(N * |targets|) entries instead of the O(N^2) full half-matrix.
+    Values are identical to spatial_dissimilarity's.
+    """
+    if instance is None:
+        instance = load_instance(instance_name)
+
+    coords, angles, lam_eff = _spatial_terms(instance_name, instance, angle_offset)
+
+    S: Dict[Tuple[int, int], float] = {}
+    for t in targets:
+        x_t, y_t = coords[t]
+        theta_t = angles[t]
+        for i, (x_i, y_i) in coords.items():
+            if i == t:
+                continue
+            dtheta = shortest_angle_diff(theta_t, angles[i])
+            S[(i, t)] = math.sqrt(
+                (x_t - x_i) ** 2 + (y_t - y_i) ** 2 + lam_eff * (dtheta) ** 2
+            )
+
+    return S
+
+
 # ----------------------------------------------------------------------
 # --- Stand-alone test -------------------------------------------------
 # ----------------------------------------------------------------------
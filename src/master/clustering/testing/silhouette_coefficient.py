@@ -9,9 +9,9 @@ K-Medoids, Fuzzy C-Medoids, Agglomerative (Average/Complete).
 Assumes that time dissimilarity is disregarded (CVRP only).
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from utils.symmetric_matrix_read import get_symmetric_value
-from clustering.dissimilarity.combined import combined_dissimilarity
+from clustering.dissimilarity.combined import combined_dissimilarity_to
 import math
 
 
@@ -19,6 +19,7 @@ def silhouette_coefficient(
     instance_name: str,
     clusters: Dict[int, List[int]],
     medoids: Dict[int, int],
+    S: Optional[Dict[Tuple[int, int], float]] = None,
 ) -> float:
     """
     Computes the overall silhouette coefficient ζ ∈ [-1, 1].
@@ -27,12 +28,18 @@ def silhouette_coefficient(
         instance_name: name of the instance (e.g., "X-n101-k25.vrp")
         clusters: {cluster_id: [list of nodes]}
         medoids: {cluster_id: medoid_node}
+        S: precomputed combined dissimilarities (the full
+           combined_dissimilarity(instance_name), or any dict holding every
+           customer-to-medoid pair); pass it when scoring several
+           clusterings of the same instance
 
     Returns:
         ζ (float): average silhouette coefficient for all customers
     """
-    # Load dissimilarity matrix (spatial + demand)
-    S = combined_dissimilarity(instance_name)
+    # Dissimilarities (spatial + demand): only customer-to-medoid pairs are
+    # read, so only those are computed (N x K, not the N^2 matrix)
+    if S is None:
+        S = combined_dissimilarity_to(instance_name, medoids.values())
 
     # Build reverse map node -> cluster
     node_to_cluster = {}
@@ -3,9 +3,9 @@
 import os, sys
 
 # --- Make sure Python finds all subpackages like utils, clustering, etc. ---
-CURRENT_DIR = os.path.dirname(__file__)
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
-    sys.path.append(CURRENT_DIR)
+    sys.path.insert(0, CURRENT_DIR)
 
 from clustering.k_medoids import k_medoids
 from clustering.fcm import fuzzy_c_medoids
@@ -16,12 +16,15 @@ Behaviour:
 
 from __future__ import annotations
 
+import os
 import time
-from typing import Dict, List, Tuple, Any, Mapping, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any, Iterator, Mapping, Optional
 
 import numpy as np
 
-from master.utils.loader import load_instance
+from master.utils.loader import coords_array, load_instance
 
 # ---------------------------------------------------------------------------
 # PyVRP imports (NO stagnation stopping – confirmed unsupported)
@@ -80,6 +83,27 @@ def _adaptive_no_improvement(n: int) -> int:
 # PyVRP cluster model
 # ---------------------------------------------------------------------------
 
+def _rounded_distances(instance: Dict[str, Any], idx0_nodes: List[int]) -> Iterator[List[int]]:
+    """
+    Integer-rounded distance rows between the given 0-based nodes, one
+    NumPy row at a time so the full-instance model never materialises a
+    dim x dim float (plus int and list) copy.
+    """
+    idx = np.asarray(idx0_nodes, dtype=np.int64)
+    edge_mat = instance.get("edge_weight")
+
+    if edge_mat is not None:
+        for oi in idx:
+            yield np.rint(edge_mat[oi, idx]).astype(np.int64).tolist()
+        return
+
+    xy = coords_array(instance)[idx]
+    for x, y in xy:
+        dx = xy[:, 0] - x
+        dy = xy[:, 1] - y
+        yield np.rint(np.sqrt(dx * dx + dy * dy)).astype(np.int64).tolist()
+
+
 def _build_cluster_model(
     instance: Dict[str, Any],
     cluster_nodes_vrplib: List[int],
@@ -88,7 +112,6 @@ def _build_cluster_model(
     coords = instance["node_coord"]
     demands = instance["demand"]
     capacity = int(instance["capacity"])
-    edge_mat = instance.get("edge_weight")
     depot_idx0 = int(instance["depot"][0])
 
     cluster_customers = sorted({nid for nid in cluster_nodes_vrplib if nid != depot_idx0 + 1})
@@ -114,18 +137,11 @@ def _build_cluster_model(
     m.add_vehicle_type(num_available=max(1, len(cluster_customers)), capacity=capacity)
 
     locations = m.locations
-    for i in range(len(locations)):
+    for i, row in enumerate(_rounded_distances(instance, idx0_nodes)):
         for j in range(len(locations)):
             if i == j:
                 continue
-            oi, oj = idx0_nodes[i], idx0_nodes[j]
-            if edge_mat is not None:
-                dist = int(round(float(edge_mat[oi, oj])))
-            else:
-                dx = coords[oi][0] - coords[oj][0]
-                dy = coords[oi][1] - coords[oj][1]
-                dist = int(round((dx * dx + dy * dy) ** 0.5))
-            m.add_edge(locations[i], locations[j], distance=dist)
+            m.add_edge(locations[i], locations[j], distance=row[j])
 
     return m, location_to_node_id
 
@@ -184,6 +200,29 @@ def _solve_cluster_with_pyvrp(
     return routes, cost
 
 
+def _pyvrp_cluster_task(
+    instance_name: str,
+    cluster_nodes_vrplib: List[int],
+    time_limit: float,
+    seed: int,
+    no_improvement: int,
+) -> Tuple[List[List[int]], float, float]:
+    """
+    Worker-process entry point: one cluster solve, plus its runtime.
+    Takes the instance name (not the dict) so only small arguments are
+    pickled; load_instance caches the instance per worker process.
+    """
+    t0 = time.time()
+    routes, cost = _solve_cluster_with_pyvrp(
+        load_instance(instance_name),
+        cluster_nodes_vrplib,
+        time_limit=time_limit,
+        seed=seed,
+        no_improvement=no_improvement,
+    )
+    return routes, cost, time.time() - t0
+
+
 # ---------------------------------------------------------------------------
 # Unified model for downstream compatibility
 # ---------------------------------------------------------------------------
@@ -192,7 +231,6 @@ def _build_unified_model(instance: Dict[str, Any]) -> Tuple[Model, Dict[int, int
     coords = instance["node_coord"]
     demands = instance["demand"]
     capacity = int(instance["capacity"])
-    edge_mat = instance.get("edge_weight")
     depot_idx0 = int(instance["depot"][0])
 
     all_customers = list(range(2, len(demands) + 1))
@@ -214,23 +252,28 @@ def _build_unified_model(instance: Dict[str, Any]) -> Tuple[Model, Dict[int, int
     m.add_vehicle_type(num_available=len(all_customers), capacity=capacity)
 
     locations = m.locations
-    for i in range(len(locations)):
+    idx0_nodes = [depot_idx0] + [cid - 1 for cid in all_customers]
+    for i, row in enumerate(_rounded_distances(instance, idx0_nodes)):
         for j in range(len(locations)):
             if i == j:
                 continue
-            oi = depot_idx0 if i == 0 else all_customers[i - 1] - 1
-            oj = depot_idx0 if j == 0 else all_customers[j - 1] - 1
-            if edge_mat is not None:
-                dist = int(round(float(edge_mat[oi, oj])))
-            else:
-                dx = coords[oi][0] - coords[oj][0]
-                dy = coords[oi][1] - coords[oj][1]
-                dist = int(round((dx * dx + dy * dy) ** 0.5))
-            m.add_edge(locations[i], locations[j], distance=dist)
+            m.add_edge(locations[i], locations[j], distance=row[j])
 
     return m, {}
 
 
+@lru_cache(maxsize=1)
+def _unified_data(instance_name: str):
+    """
+    ProblemData of the full-instance model, built once per instance: it
+    only depends on the instance, but has dim^2 edges, so rebuilding it
+    on every solve_clusters call dominated short DRSCI iterations. Only
+    the last instance is kept (a DRSCI run uses a single instance).
+    """
+    unified_model, _ = _build_unified_model(load_instance(instance_name))
+    return unified_model.data()
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -243,7 +286,19 @@ def solve_clusters(
     solver_options: Optional[Mapping[str, Any]] = None,
     seed: int = 0,
     no_improvement: Optional[int] = None,
+    n_jobs: Optional[int] = 1,
+    executor: Optional[Executor] = None,
 ) -> Result:
+    """
+    n_jobs: PyVRP clusters are independent, so with n_jobs != 1 they are
+    solved in that many worker processes (None or < 1: one per CPU).
+    Results are merged in cluster order, as in the sequential run; other
+    solvers always run sequentially.
+
+    executor: a long-lived process pool to solve PyVRP clusters in, so
+    repeated calls (one per DRSCI iteration) do not start a new pool each
+    time; n_jobs is then ignored and the caller shuts it down.
+    """
 
     solver_key = solver.lower()
     solver_options = dict(solver_options or {})
@@ -257,81 +312,115 @@ def solve_clusters(
     if solver_key != "pyvrp":
         from master.routing.solver import solve as routing_solve  # type: ignore
 
-    for cid, nodes in clusters.items():
-        customers = [nid for nid in nodes if nid != 1]
-        n = len(customers)
-
-        cluster_time = _adaptive_cluster_time(n)
-        stall_time = _adaptive_stall_time(n)
+    owned_executor = None
+    if solver_key != "pyvrp" or len(clusters) <= 1:
+        executor = None
+    elif executor is None and n_jobs != 1:
+        workers = n_jobs if n_jobs is not None and n_jobs > 0 else (os.cpu_count() or 1)
+        workers = min(workers, len(clusters))
+        if workers > 1:
+            executor = owned_executor = ProcessPoolExecutor(max_workers=workers)
+
+    futures = {}
+    try:
+        for cid, nodes in clusters.items():
+            customers = [nid for nid in nodes if nid != 1]
+            n = len(customers)
+
+            cluster_time = _adaptive_cluster_time(n)
+            stall_time = _adaptive_stall_time(n)
         
-        # Calculate adaptive no-improvement iterations based on cluster size
-        adaptive_no_improvement = _adaptive_no_improvement(n)
+            # Calculate adaptive no-improvement iterations based on cluster size
+            adaptive_no_improvement = _adaptive_no_improvement(n)
         
-        # Override with provided no_improvement if given (for testing/debugging)
-        effective_no_improvement = adaptive_no_improvement
-        if no_improvement is not None:
-            effective_no_improvement = no_improvement
-
-        # if solver_key == "pyvrp":
-        #     # print(
-        #     #     f"[ROUTING] solver={solver_key} | cluster={cid} | "
-        #     #     f"n={n} | no_improvement={effective_no_improvement} | "
-        #     #     f"time_limit={cluster_time:.2f}s",
-        #     #     flush=True,
-        #     # )
-        # else:
-        #     print(
-        #         f"[ROUTING] solver={solver_key} | cluster={cid} | "
-        #         f"n={n} | no_improvement={effective_no_improvement}",
-        #         flush=True,
-        #     )
-
-        t0 = time.time()
-
-        if solver_key == "pyvrp":
-            routes, cost = _solve_cluster_with_pyvrp(
-                instance,
-                customers,
-                time_limit=cluster_time,
-                seed=seed + cid,
-                no_improvement=effective_no_improvement*10,
-            )
-        else:
-            opts = {
-                **solver_options,
-                "cluster_nodes": customers,
-                "seed": seed + cid,
-            }
-            
-            # AILS2: Use adaptive time limit (prioritized) and no-improvement (fallback)
-            # AILS2 supports either Time OR Iteration stopping criterion, not both.
-            # We provide both, but AILS2 will use max_runtime (adaptive time limit) when provided.
-            if solver_key == "ails2":
-                opts["max_runtime"] = cluster_time  # Adaptive time limit based on cluster size
-                opts["no_improvement"] = effective_no_improvement  # Fallback if max_runtime not used
-            else:
-                # FILO: Only use no_improvement, no time limit
-                opts["no_improvement"] = effective_no_improvement
-
-            # Only add stall_time if explicitly enabled (for Hexaly)
-            if solver_options.get("use_stall", False):
-                opts["stall_time"] = stall_time
-
-            out = routing_solve(
-                instance=instance_name,
-                solver=solver_key,
-                solver_options=opts,
-            )
-
-            routes = out.metadata["routes_vrplib"]
-            cost = float(out.cost)
-
-        total_runtime += time.time() - t0
-        all_routes.extend(routes)
-        cluster_costs[cid] = cost
+            # Override with provided no_improvement if given (for testing/debugging)
+            effective_no_improvement = adaptive_no_improvement
+            if no_improvement is not None:
+                effective_no_improvement = no_improvement
+
+            # if solver_key == "pyvrp":
+            #     # print(
+            #     #     f"[ROUTING] solver={solver_key} | cluster={cid} | "
+            #     #     f"n={n} | no_improvement={effective_no_improvement} | "
+            #     #     f"time_limit={cluster_time:.2f}s",
+            #     #     flush=True,
+            #     # )
+            # else:
+            #     print(
+            #         f"[ROUTING] solver={solver_key} | cluster={cid} | "
+            #         f"n={n} | no_improvement={effective_no_improvement}",
+            #         flush=True,
+            #     )
+
+            t0 = time.time()
+
+            if executor is not None:
+                futures[cid] = executor.submit(
+                    _pyvrp_cluster_task,
+                    instance_name,
+                    customers,
+                    cluster_time,
+                    seed + cid,
+                    effective_no_improvement*10,
+                )
+                continue
 
-    unified_model, _ = _build_unified_model(instance)
-    unified_data = unified_model.data()
+            if solver_key == "pyvrp":
+                routes, cost = _solve_cluster_with_pyvrp(
+                    instance,
+                    customers,
+                    time_limit=cluster_time,
+                    seed=seed + cid,
+                    no_improvement=effective_no_improvement*10,
+                )
+            else:
+                opts = {
+                    **solver_options,
+                    "cluster_nodes": customers,
+                    "seed": seed + cid,
+                }
+            
+                # AILS2: Use adaptive time limit (prioritized) and no-improvement (fallback)
+                # AILS2 supports either Time OR Iteration stopping criterion, not both.
+                # We provide both, but AILS2 will use max_runtime (adaptive time limit) when provided.
+                if solver_key == "ails2":
+                    opts["max_runtime"] = cluster_time  # Adaptive time limit based on cluster size
+                    opts["no_improvement"] = effective_no_improvement  # Fallback if max_runtime not used
+                else:
+                    # FILO: Only use no_improvement, no time limit
+                    opts["no_improvement"] = effective_no_improvement
+
+                # Only add stall_time if explicitly enabled (for Hexaly)
+                if solver_options.get("use_stall", False):
+                    opts["stall_time"] = stall_time
+
+                out = routing_solve(
+                    instance=instance_name,
+                    solver=solver_key,
+                    solver_options=opts,
+                )
+
+                routes = out.metadata["routes_vrplib"]
+                cost = float(out.cost)
+
+            total_runtime += time.time() - t0
+            all_routes.extend(routes)
+            cluster_costs[cid] = cost
+
+        if executor is not None:
+            for cid, future in futures.items():
+                routes, cost, runtime = future.result()
+                total_runtime += runtime
+                all_routes.extend(routes)
+                cluster_costs[cid] = cost
+    finally:
+        # on an error, drop clusters not started yet (also in a caller's pool)
+        for future in futures.values():
+            future.cancel()
+        if owned_executor is not None:
+            owned_executor.shutdown(cancel_futures=True)
+
+    unified_data = _unified_data(instance_name)
 
     routes_pyvrp = [
         [nid - 1 for nid in r if nid != 1]
@@ -18,7 +18,6 @@ from __future__ import annotations
 
 import sys
 import time
-import math
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
@@ -39,8 +38,9 @@ from master.clustering.route_based import route_based_decomposition
 from master.routing.routing_controller import solve_clusters
 from master.improve.ls_controller import improve_with_local_search
 from master.setcover.duplicate_removal import remove_duplicates
-from master.utils.loader import load_instance
+from master.utils.loader import load_instance, rounded_edge_weights
 from master.setcover.route_dominance_filter import filter_route_pool
+from master.setcover.route_costs import matrix_route_costs
 
 
 
@@ -101,22 +101,7 @@ def _result_to_vrplib_routes(result) -> Routes:
 
 
 def compute_integer_rounded_cost(instance: dict, routes: Routes) -> int:
-    coords = instance["node_coord"]
-    edge_mat = instance.get("edge_weight")
-
-    def dist(u: int, v: int) -> int:
-        u_idx, v_idx = u - 1, v - 1
-        if edge_mat is not None:
-            return int(round(float(edge_mat[u_idx, v_idx])))
-        dx = coords[u_idx][0] - coords[v_idx][0]
-        dy = coords[u_idx][1] - coords[v_idx][1]
-        return int(round(math.hypot(dx, dy)))
-
-    total = 0
-    for r in routes:
-        for a, b in zip(r, r[1:]):
-            total += dist(a, b)
-    return total
+    return int(sum(matrix_route_costs(rounded_edge_weights(instance), routes, round_edges=True)))
 
 
 def _format_cluster_sizes(clusters: Dict[Any, List[int]]) -> str:
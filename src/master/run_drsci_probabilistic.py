@@ -7,7 +7,7 @@ import json
 import sys
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Mapping, Tuple
+from typing import Dict, List, Optional, Any, Mapping, Tuple, FrozenSet
 from collections import Counter
 
 # ---------------------------------------------------------
@@ -24,7 +24,6 @@ from master.routing.routing_controller import solve_clusters
 from master.routing.solver import solve as routing_solve
 from master.improve.ls_controller import improve_with_local_search
 from master.setcover.duplicate_removal import remove_duplicates
-from master.setcover.route_dominance_filter import filter_route_pool
 from master.utils.loader import load_instance
 from master.utils.solution_helpers import load_routes_from_sol_for_pool
 from master.setcover.route_pool_filtering import filter_route_pool_for_scp
@@ -38,6 +37,7 @@ from master.utils.helpers_run_probabilistic import (
     RouteKey,
     Tag,
     _route_key,
+    _add_to_pool,
     _tag_new_routes,
     _result_to_vrplib_routes,
     _compute_integer_cost,
@@ -102,7 +102,7 @@ SOLVERS = ["pyvrp", "filo1", "filo2", "ails2"]
 Route = List[int]
 Routes = List[Route]
 
-RouteKey = Tuple[int, ...]
+RouteKey = FrozenSet[int]
 Tag = Dict[str, Any]
 
 def run_drsci_probabilistic(
@@ -147,6 +147,8 @@ def run_drsci_probabilistic(
     instance_base = Path(instance_name).stem
 
     global_route_pool: Routes = []
+    # customer set -> first route seen with it; global_route_pool is its values
+    pool_by_key: Dict[RouteKey, Route] = {}
     route_tags: Dict[RouteKey, Tag] = {}
     
     # TERMINATION LOGIC COMMENTED OUT
@@ -206,7 +208,7 @@ def run_drsci_probabilistic(
                 depot_id=1,
             )
 
-            global_route_pool.extend(routes_from_sol)
+            _add_to_pool(pool_by_key, routes_from_sol)
 
             _tag_new_routes(
                 route_tags,
@@ -220,12 +222,7 @@ def run_drsci_probabilistic(
                 },
             )
 
-        # Safety: filter immediately
-        global_route_pool = filter_route_pool(
-            global_route_pool,
-            depot_id=1,
-            verbose=False,
-        )
+        global_route_pool = list(pool_by_key.values())
 
         msg = (
             f"[{instance_base} WARM-START] "
@@ -596,8 +593,8 @@ def run_drsci_probabilistic(
                     output_dir=bks_output_dir,
                 )
 
-            global_route_pool.extend(candidate_routes)
-            global_route_pool = filter_route_pool(global_route_pool, depot_id=1, verbose=False)
+            _add_to_pool(pool_by_key, candidate_routes)
+            global_route_pool = list(pool_by_key.values())
 
             # ---------------- SCP ----------------
             if run_scp_now:
@@ -680,8 +677,8 @@ def run_drsci_probabilistic(
                 scp_cost = _compute_integer_cost(inst, scp_routes)
 
                 # Enrich route pool
-                global_route_pool.extend(scp_routes)
-                global_route_pool = filter_route_pool(global_route_pool, depot_id=1, verbose=False)
+                _add_to_pool(pool_by_key, scp_routes)
+                global_route_pool = list(pool_by_key.values())
 
                 # Tag SCP-produced routes
                 _tag_new_routes(
@@ -850,8 +847,8 @@ def run_drsci_probabilistic(
         final_routes = final_ls["routes_improved"]
         final_cost = _compute_integer_cost(inst, final_routes)
 
-        global_route_pool.extend(final_routes)
-        global_route_pool = filter_route_pool(global_route_pool, depot_id=1, verbose=False)
+        _add_to_pool(pool_by_key, final_routes)
+        global_route_pool = list(pool_by_key.values())
 
         _tag_new_routes(
             route_tags,
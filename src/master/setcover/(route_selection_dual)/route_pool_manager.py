@@ -12,37 +12,115 @@ Responsibilities:
 - Preserve provenance information (where routes came from)
 
 Extended (for dual-based pipeline):
-- Expose structural views (customers, route_cust, costs)
+- Expose structural views (customers, route_cust, coverage_csr, costs)
 - Attach instance data explicitly (no implicit loading)
 - Remains solver-agnostic (NO optimization logic)
 
 Key invariant (IMPORTANT):
-- Route costs are cached and MUST be invalidated whenever the route set changes.
+- Route costs are cached and MUST stay aligned with the route list:
+  new routes extend the cache, a new instance invalidates it.
 """
 
 from __future__ import annotations
 
-from typing import List, Dict, Set, Optional
+from array import array
+from itertools import chain
+from typing import List, Dict, Sequence, Set, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from master.utils.loader import coords_array
+from master.setcover.route_costs import (
+    DIST_MATRIX_MAX_DIM,
+    euclidean_costs_flat,
+    euclidean_distance_matrix,
+    matrix_costs_flat,
+)
 
 
 Route = List[int]   # VRPLIB format: [1, ..., 1]
 Routes = List[Route]
 
 
-def _customer_set(route: Route, depot_id: int = 1) -> frozenset[int]:
-    return frozenset(n for n in route if n != depot_id)
+def _customer_sig(route: Route, depot_id: int = 1) -> bytes:
+    """
+    Customer-set signature: sorted customer ids packed as uint16 bytes.
+
+    One small bytes object per route instead of a frozenset hash table
+    (~60 vs ~700 bytes for a 15-customer route). Node ids must fit in
+    uint16 (array raises OverflowError otherwise).
+    """
+    return array("H", sorted(set(route) - {depot_id})).tobytes()
+
+
+def _sig_customers(sig: bytes) -> array:
+    customers = array("H")
+    customers.frombytes(sig)
+    return customers
+
+
+# Random 64-bit key per node id (uint16 range, matching _customer_sig)
+_NODE_HASH = np.random.default_rng(0).integers(1, 2**63, size=1 << 16, dtype=np.uint64)
+
+
+def _batch_hashes(
+    routes: Routes, depot_id: int = 1
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Order-independent (xor hash, size, id sum) of each route's customer set,
+    computed for the whole batch at once.
+
+    The xor of per-node random keys is the primary dedup key; size and id
+    sum are a cheap confirmation so that a hash collision between two
+    different customer sets does not merge them.
+    """
+    n = len(routes)
+    lengths = np.fromiter(map(len, routes), dtype=np.int64, count=n)
+    flat = np.fromiter(chain.from_iterable(routes), dtype=np.int64, count=int(lengths.sum()))
+    if not len(flat):
+        return [0] * n, [0] * n, [0] * n
+
+    is_cust = flat != depot_id
+    # set semantics: a customer repeated within a route counts once
+    route_of = np.repeat(np.arange(n), lengths)
+    order = np.lexsort((flat, route_of))
+    repeat = (flat[order[1:]] == flat[order[:-1]]) & (route_of[order[1:]] == route_of[order[:-1]])
+    is_cust[order[1:][repeat]] = False
+
+    starts = np.zeros_like(lengths)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    np.minimum(starts, len(flat) - 1, out=starts)  # reduceat needs valid offsets
+
+    h = np.bitwise_xor.reduceat(np.where(is_cust, _NODE_HASH[flat], np.uint64(0)), starts)
+    size = np.add.reduceat(is_cust.astype(np.int64), starts)
+    idsum = np.add.reduceat(np.where(is_cust, flat, 0), starts)
+
+    # reduceat yields the element at the offset for empty segments
+    empty = lengths == 0
+    h[empty] = 0
+    size[empty] = 0
+    idsum[empty] = 0
+
+    return h.tolist(), size.tolist(), idsum.tolist()
 
 
 class RoutePoolManager:
     """
     Pool manager with strict API discipline:
-    - routes is a PROPERTY (list) => never call routes()
-    - costs is cached, but invalidated whenever pool changes
+    - routes is a PROPERTY (list copy) => never call routes()
+    - routes_view() returns the internal list without copying (read-only by contract)
+    - costs is cached, extended on add, invalidated on attach_instance
     """
 
     def __init__(self) -> None:
         self._routes: Routes = []
-        self._custset_to_idx: Dict[frozenset[int], int] = {}
+        # the same routes stored flat for numeric work (int32 node ids)
+        self._nodes = array("i")
+        self._lengths = array("q")
+        self._custsigs: List[bytes] = []  # aligned with self._routes
+        self._checks: List[Tuple[int, int]] = []  # (size, id sum), aligned with self._routes
+        self._sig_to_idx: Dict[int, List[int]] = {}  # xor hash -> route indices
 
         self._sources: Dict[int, Set[str]] = {}
         self._is_incumbent: Set[int] = set()
@@ -52,6 +130,12 @@ class RoutePoolManager:
         self._customers: Optional[List[int]] = None
 
         self._costs_cache: Optional[List[float]] = None  # aligned with self._routes
+        self._dist_matrix = None  # set by attach_instance (if affordable)
+
+        # CSR coverage (routes x customers), grown on add, built lazily
+        self._cov_indptr = array("q", [0])
+        self._cov_nodes = array("H")  # customer node ids, row-concatenated
+        self._cov_csr: Optional[sp.csr_matrix] = None
 
     # ------------------------------------------------------------------
     # Cache discipline
@@ -59,6 +143,20 @@ class RoutePoolManager:
     def _invalidate_costs(self) -> None:
         self._costs_cache = None
 
+    def _route_costs(self, first_route: int = 0, first_node: int = 0) -> List[float]:
+        """Costs of routes[first_route:], read from the flat node buffer."""
+        # Only new routes reach this (see add_routes), in one vectorized /
+        # compiled pass. A prefix-cost cache for routes sharing prefixes was
+        # measured ~15x slower: the per-route tuple hashing costs more than
+        # the edge gathers it saves.
+        # copies (plain memcpy): the buffers must stay growable
+        flat = np.frombuffer(self._nodes, dtype=np.int32)[first_node:].copy()
+        lengths = np.frombuffer(self._lengths, dtype=np.int64)[first_route:].copy()
+
+        if self._dist_matrix is not None:
+            return matrix_costs_flat(self._dist_matrix, flat, lengths)
+        return euclidean_costs_flat(coords_array(self._instance), flat, lengths)
+
     # ------------------------------------------------------------------
     # Basic access
     # ------------------------------------------------------------------
@@ -67,6 +165,13 @@ class RoutePoolManager:
         # return copy to avoid accidental external mutation
         return list(self._routes)
 
+    def routes_view(self) -> Sequence[Route]:
+        """
+        Internal route list, no copy. Callers must not mutate it; meant for
+        hot read-only paths (solvers, coverage building) on large pools.
+        """
+        return self._routes
+
     def size(self) -> int:
         return len(self._routes)
 
@@ -78,8 +183,31 @@ class RoutePoolManager:
 
     @property
     def route_cust(self) -> List[Set[int]]:
-        depot = self._depot_id
-        return [set(_customer_set(r, depot)) for r in self._routes]
+        return [set(_sig_customers(sig)) for sig in self._custsigs]
+
+    def coverage_csr(self) -> sp.csr_matrix:
+        """
+        0/1 coverage matrix (n_routes x n_customers), column k = customers[k].
+        Cached until new routes are added.
+        """
+        if self._customers is None:
+            raise RuntimeError("Instance not attached to RoutePoolManager.")
+
+        if self._cov_csr is None:
+            # copies: the arrays must stay growable (no live buffer exports)
+            indices = np.frombuffer(self._cov_nodes, dtype=np.uint16).astype(np.int32)
+            indices -= self._depot_id + 1
+            indptr = np.frombuffer(self._cov_indptr, dtype=np.int64).copy()
+            self._cov_csr = sp.csr_matrix(
+                (np.ones(len(indices)), indices, indptr),
+                shape=(len(self._routes), len(self._customers)),
+            )
+        return self._cov_csr
+
+    @property
+    def dist_matrix(self):
+        """Dense distance matrix of the attached instance (None if too large)."""
+        return self._dist_matrix
 
     @property
     def costs(self) -> List[float]:
@@ -87,31 +215,13 @@ class RoutePoolManager:
             raise RuntimeError("Instance not attached to RoutePoolManager.")
 
         if self._costs_cache is None:
-            inst = self._instance
-            coords = inst["node_coord"]
-            edge_mat = inst.get("edge_weight")
-
-            def dist(u: int, v: int) -> float:
-                if edge_mat is not None:
-                    return float(edge_mat[u - 1, v - 1])
-                x1, y1 = coords[u - 1]
-                x2, y2 = coords[v - 1]
-                return ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
-
-            costs: List[float] = []
-            for r in self._routes:
-                c = 0.0
-                for a, b in zip(r, r[1:]):
-                    c += dist(a, b)
-                costs.append(c)
-
-            self._costs_cache = costs
+            self._costs_cache = self._route_costs()
 
         # Hard safety check: alignment must always hold
         if len(self._costs_cache) != len(self._routes):
             raise RuntimeError(
                 "Costs cache is out of sync with route list. "
-                "This indicates a missing cache invalidation."
+                "This indicates a missing cache update."
             )
 
         return self._costs_cache
@@ -126,45 +236,88 @@ class RoutePoolManager:
         dim = int(instance["dimension"])
         self._customers = list(range(depot_id + 1, dim + 1))
 
+        # distance matrix once per instance: explicit weights if given,
+        # otherwise precomputed from coords unless too large
+        self._dist_matrix = instance.get("edge_weight")
+        if self._dist_matrix is None and dim <= DIST_MATRIX_MAX_DIM:
+            self._dist_matrix = euclidean_distance_matrix(coords_array(instance))
+
         self._invalidate_costs()
+        self._cov_csr = None
 
     # ------------------------------------------------------------------
     # Adding routes (dedup by customer set)
     # ------------------------------------------------------------------
+    def _find(self, bucket: Optional[List[int]], check: Tuple[int, int]) -> Optional[int]:
+        if bucket is not None:
+            for j in bucket:
+                if self._checks[j] == check:
+                    return j
+        return None
+
+    def lookup(self, routes: Routes) -> List[Optional[int]]:
+        """Pool index of each route's customer set (None if not pooled); never adds."""
+        hashes, sizes, idsums = _batch_hashes(routes, self._depot_id)
+        return [
+            self._find(self._sig_to_idx.get(h), check)
+            for h, check in zip(hashes, zip(sizes, idsums))
+        ]
+
     def add_routes(
         self,
         routes: Routes,
         *,
         source: str,
         mark_incumbent: bool = False,
-    ) -> None:
+    ) -> List[int]:
+        """
+        Add routes (deduplicated by customer set) and return the pool index
+        of each input route, whether newly added or already pooled.
+        """
         if self._instance is None:
             # Not strictly required, but avoids depot mismatch surprises later
             pass
 
-        changed = False
+        first_route, first_node = len(self._routes), len(self._nodes)
+        indices: List[int] = []
+        hashes, sizes, idsums = _batch_hashes(routes, self._depot_id)
 
-        for r in routes:
-            cs = _customer_set(r, self._depot_id)
+        for r, h, check in zip(routes, hashes, zip(sizes, idsums)):
+            bucket = self._sig_to_idx.get(h)
+            idx = self._find(bucket, check)
 
-            if cs in self._custset_to_idx:
-                idx = self._custset_to_idx[cs]
+            if idx is not None:
                 self._sources[idx].add(source)
-                if mark_incumbent:
-                    self._is_incumbent.add(idx)
+                indices.append(idx)
                 continue
 
             idx = len(self._routes)
+            cs = _customer_sig(r, self._depot_id)
             self._routes.append(r)
-            self._custset_to_idx[cs] = idx
+            self._nodes.extend(r)
+            self._lengths.append(len(r))
+            self._custsigs.append(cs)
+            self._cov_nodes.frombytes(cs)
+            self._cov_indptr.append(len(self._cov_nodes))
+            self._checks.append(check)
+            if bucket is None:
+                self._sig_to_idx[h] = [idx]
+            else:
+                bucket.append(idx)
             self._sources[idx] = {source}
-            if mark_incumbent:
-                self._is_incumbent.add(idx)
+            indices.append(idx)
+
+        if mark_incumbent:
+            self._is_incumbent.update(indices)
 
-            changed = True
+        # extend the cost cache with the new routes only
+        added = len(self._routes) > first_route
+        if added and self._costs_cache is not None:
+            self._costs_cache.extend(self._route_costs(first_route, first_node))
+        if added:
+            self._cov_csr = None
 
-        if changed:
-            self._invalidate_costs()
+        return indices
 
     # ------------------------------------------------------------------
     # Incumbent handling (needed by run_drsci_dual.py)
@@ -173,15 +326,8 @@ class RoutePoolManager:
         """
         Mark routes as incumbent. If they are not in pool yet, add them.
         """
-        # First ensure they are in pool
-        self.add_routes(routes, source=source, mark_incumbent=True)
-
-        # Then mark indices (already done by add_routes for new ones; for existing ones we need to find them)
-        for r in routes:
-            cs = _customer_set(r, self._depot_id)
-            idx = self._custset_to_idx.get(cs)
-            if idx is not None:
-                self._is_incumbent.add(idx)
+        # one pass: add_routes resolves new and already-pooled routes alike
+        self._is_incumbent.update(self.add_routes(routes, source=source))
 
     # ------------------------------------------------------------------
     # Diagnostics
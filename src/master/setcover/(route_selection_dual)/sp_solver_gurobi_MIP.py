@@ -17,11 +17,14 @@ This is the "exact recombination" step after dual-based filtering.
 
 from __future__ import annotations
 
-import math
-from typing import Dict, List, Optional, Set, Tuple
+from itertools import chain
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
 
 try:
-    from gurobipy import Model, GRB, quicksum
+    from gurobipy import Model, GRB
 except ImportError as e:
     raise ImportError(
         "gurobipy is required for restricted SP solving.\n"
@@ -30,6 +33,9 @@ except ImportError as e:
     ) from e
 
 from master.utils.loader import load_instance
+from master.setcover.gurobi_tuning import configure_gurobi, gurobi_env
+from master.setcover.scp_solver_gurobi_MIP import IncrementalSCP
+from master.setcover.route_costs import compute_route_costs, matrix_route_costs
 
 Route = List[int]
 Routes = List[Route]
@@ -39,90 +45,128 @@ def _custset(route: Route, depot_id: int = 1) -> frozenset[int]:
     return frozenset(n for n in route if n != depot_id)
 
 
-def _compute_route_costs_euclidean(instance: dict, routes: Routes) -> List[float]:
-    coords = instance["node_coord"]
-
-    def dist(u: int, v: int) -> float:
-        x1, y1 = coords[u - 1]
-        x2, y2 = coords[v - 1]
-        return math.hypot(x2 - x1, y2 - y1)
+def _coverage_matrix(cust_routes: List[List[int]], n_routes: int) -> sp.csr_matrix:
+    """
+    Sparse (customers x routes) 0/1 matrix, row k = customer k + 2.
+    The rows are exactly the cust_routes lists, so they become the CSR
+    indices directly without a COO -> CSR conversion.
+    """
+    indptr = np.zeros(len(cust_routes) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, cust_routes), dtype=np.int64, count=len(cust_routes)),
+              out=indptr[1:])
+    indices = np.fromiter(chain.from_iterable(cust_routes), dtype=np.int64, count=int(indptr[-1]))
 
-    costs: List[float] = []
-    for route in routes:
-        c = 0.0
-        for u, v in zip(route, route[1:]):
-            c += dist(u, v)
-        costs.append(c)
-    return costs
+    return sp.csr_matrix(
+        (np.ones(len(indices)), indices, indptr), shape=(len(cust_routes), n_routes)
+    )
 
 
 def solve_restricted_sp(
     *,
     instance_name: str,
-    route_pool: Routes,
+    route_pool: Optional[Sequence[Route]] = None,
     time_limit: Optional[float] = None,
     verbose: bool = False,
     depot_id: int = 1,
     costs: Optional[List[float]] = None,
     warm_start_routes: Optional[Routes] = None,
+    dist_matrix=None,
+    pool: Optional[Any] = None,
+    gurobi_params: Optional[Mapping[str, Any]] = None,
+    sig_to_idx: Optional[Dict[frozenset, int]] = None,
 ) -> Dict[str, object]:
     """
     Returns dict compatible with your SCP solver schema:
       solver, optimal, status, obj_value, selected_indices, selected_routes
-    """
-    if not route_pool:
-        raise ValueError("[RSP] route_pool is empty.")
 
-    inst = load_instance(instance_name)
-    dim = int(inst["dimension"])
-    customers = list(range(2, dim + 1))
+    If costs are not given, they are gathered from dist_matrix (when
+    provided) or from the instance's edge weights.
+
+    If an instance-attached RoutePoolManager is given as pool, its routes,
+    customers, coverage and cached costs are used instead (route_pool and
+    costs are ignored, the instance is not loaded).
+
+    gurobi_params: extra Gurobi parameters set on the model
+    (e.g. gurobi_tuning.PRESETS["rsp"]); None keeps Gurobi defaults.
 
-    # Build coverage
-    route_cust: List[Set[int]] = []
-    for r in route_pool:
-        route_cust.append({nid for nid in r if nid != depot_id})
+    sig_to_idx: optional precomputed {customer frozenset: index into
+    route_pool} for matching warm_start_routes; built here if None. With
+    a pool, its own index is used (RoutePoolManager.lookup).
+    """
+    if pool is not None:
+        route_pool = pool.routes_view()
 
-    cust_routes: Dict[int, List[int]] = {i: [] for i in customers}
-    for r_idx, custs in enumerate(route_cust):
-        for i in custs:
-            if i in cust_routes:
-                cust_routes[i].append(r_idx)
+    if not route_pool:
+        raise ValueError("[RSP] route_pool is empty.")
 
-    uncovered = [i for i, rlist in cust_routes.items() if not rlist]
+    if pool is not None:
+        customers = pool.customers
+        costs = pool.costs
+        A = pool.coverage_csr().T.tocsr()
+    else:
+        inst = load_instance(instance_name)
+        dim = int(inst["dimension"])
+        customers = list(range(2, dim + 1))
+
+        # Build coverage
+        route_cust: List[Set[int]] = []
+        for r in route_pool:
+            route_cust.append({nid for nid in r if nid != depot_id})
+
+        # cust_routes[i - 2] = route indices visiting customer i
+        cust_routes: List[List[int]] = [[] for _ in customers]
+        for r_idx, custs in enumerate(route_cust):
+            for i in custs:
+                if 2 <= i <= dim:
+                    cust_routes[i - 2].append(r_idx)
+
+        # row k = customer k + 2
+        A = _coverage_matrix(cust_routes, len(route_pool))
+
+    uncovered = [customers[k] for k in np.flatnonzero(np.diff(A.indptr) == 0)]
     if uncovered:
         raise ValueError(f"[RSP] infeasible restricted pool: uncovered customers={uncovered[:20]}")
 
-    if costs is None:
-        costs = _compute_route_costs_euclidean(inst, route_pool)
+    if costs is None and dist_matrix is not None:
+        costs = matrix_route_costs(dist_matrix, route_pool)
+    elif costs is None:
+        costs = compute_route_costs(inst, route_pool)
 
     n_routes = len(route_pool)
 
-    model = Model("restricted_sp")
+    model = Model("restricted_sp", env=gurobi_env())
     model.Params.OutputFlag = 1 if verbose else 0
     if time_limit is not None:
         model.Params.TimeLimit = float(time_limit)
+    configure_gurobi(model, gurobi_params)
 
     # Binary variables
-    x = model.addVars(n_routes, vtype=GRB.BINARY, name="x")
+    x = model.addMVar(n_routes, vtype=GRB.BINARY, name="x")
 
-    model.setObjective(quicksum(costs[r] * x[r] for r in range(n_routes)), GRB.MINIMIZE)
+    model.setObjective(np.asarray(costs, dtype=np.float64) @ x, GRB.MINIMIZE)
 
-    # Partition constraints: exactly once
-    for i in customers:
-        model.addConstr(quicksum(x[r] for r in cust_routes[i]) == 1, name=f"par_{i}")
+    # Partition constraints: exactly once (one matrix constraint)
+    model.addMConstr(A, x, "=", np.ones(len(customers)), name="par")
 
     # Warm start (by customer-set signature)
     if warm_start_routes:
-        sig_to_idx = {_custset(r, depot_id): idx for idx, r in enumerate(route_pool)}
-        warm = set()
-        for r in warm_start_routes:
-            sig = _custset(r, depot_id)
-            if sig in sig_to_idx:
-                warm.add(sig_to_idx[sig])
-
-        # Set starts
-        for r in range(n_routes):
-            x[r].Start = 1.0 if r in warm else 0.0
+        if pool is not None:
+            warm = {idx for idx in pool.lookup(warm_start_routes) if idx is not None}
+        else:
+            if sig_to_idx is None:
+                sig_to_idx = {_custset(r, depot_id): idx for idx, r in enumerate(route_pool)}
+            warm = set()
+            for r in warm_start_routes:
+                sig = _custset(r, depot_id)
+                if sig in sig_to_idx:
+                    warm.add(sig_to_idx[sig])
+
+        # Partial start: fix only the incumbent's routes to 1 and leave the
+        # rest undefined, so Gurobi can complete the start heuristically
+        if warm:
+            start = np.full(n_routes, GRB.UNDEFINED)
+            start[list(warm)] = 1.0
+            x.Start = start
 
     model.optimize()
 
@@ -141,8 +185,7 @@ def solve_restricted_sp(
 
     obj_value = float(model.objVal)
 
-    sol = model.getAttr("X", x)
-    selected_indices = [r for r in range(n_routes) if sol[r] > 0.5]
+    selected_indices = np.flatnonzero(x.X > 0.5).tolist()
     selected_routes = [route_pool[r] for r in selected_indices]
 
     return {
@@ -153,3 +196,14 @@ def solve_restricted_sp(
         "selected_indices": selected_indices,
         "selected_routes": selected_routes,
     }
+
+
+class IncrementalRSP(IncrementalSCP):
+    """
+    Persistent restricted SP model: same column-wise growth as
+    IncrementalSCP, with partition (== 1) rows instead of cover rows.
+    """
+
+    SOLVER = "gurobi_rsp"
+    SENSE = GRB.EQUAL
+    ROW_NAME = "par"
@@ -21,7 +21,7 @@ from __future__ import annotations
 import math
 from typing import Dict, List, Tuple, Optional
 
-from master.utils.loader import load_instance
+from master.utils.loader import coords_array, load_instance
 from master.improve.ls_controller import improve_with_local_search
 
 
@@ -72,12 +72,14 @@ def _build_distance_function(instance: dict):
     """
     Build a simple Euclidean distance function dist(u, v) from instance coords.
     """
-    coords = instance["node_coord"]  # index 0 -> node 1
+    # plain Python floats: unpacking NumPy scalars costs ~10x the hypot itself
+    coords = coords_array(instance).tolist()  # index 0 -> node 1
+    hypot = math.hypot
 
     def dist(u: int, v: int) -> float:
         x1, y1 = coords[u - 1]
         x2, y2 = coords[v - 1]
-        return math.hypot(x2 - x1, y2 - y1)
+        return hypot(x2 - x1, y2 - y1)
 
     return dist
 
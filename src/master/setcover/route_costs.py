@@ -0,0 +1,255 @@
+"""
+Vectorized route cost helpers shared by the SCP / SP layers.
+
+All routes of a pool are concatenated into one flat node array, so the
+coordinate (or matrix) gather, the edge lengths and the per-route sums
+each run as a single NumPy operation instead of one Python step per edge.
+If numba is installed, a compiled per-route kernel is used instead.
+
+VRPLIB convention:
+    - node IDs start at 1, coords/matrix row 0 belongs to node 1 (depot)
+    - routes are given as node IDs, e.g. [1, 5, 23, 1]
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+from typing import List, Tuple
+
+import numpy as np
+
+from master.utils.loader import coords_array
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the NumPy path is used instead
+    njit = None
+
+
+Route = List[int]
+Routes = List[Route]
+
+
+# ------------------------------------------------------------------
+# Flattening
+# ------------------------------------------------------------------
+
+def _flatten_routes(routes: Routes) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (flat node ids, route lengths) for the whole pool."""
+    n = len(routes)
+    lengths = np.fromiter((len(r) for r in routes), dtype=np.int64, count=n)
+    flat = np.fromiter(
+        chain.from_iterable(routes), dtype=np.int64, count=int(lengths.sum())
+    )
+    return flat, lengths
+
+
+def _flatten_edges(flat: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return (tails, heads, route_of_edge) for all consecutive node pairs
+    inside each route, as 0-based node indices.
+    """
+    route_of = np.repeat(np.arange(len(lengths)), lengths)
+
+    # pair k = (flat[k], flat[k + 1]) is an edge iff both belong to the same route
+    same_route = route_of[:-1] == route_of[1:]
+    tails = flat[:-1][same_route] - 1
+    heads = flat[1:][same_route] - 1
+
+    return tails, heads, route_of[:-1][same_route]
+
+
+# ------------------------------------------------------------------
+# Numba kernels (optional)
+# ------------------------------------------------------------------
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _euclidean_kernel(coords, flat, starts, lengths, out):
+        for r in prange(lengths.shape[0]):
+            c = 0.0
+            base = starts[r]
+            for k in range(lengths[r] - 1):
+                u = flat[base + k] - 1
+                v = flat[base + k + 1] - 1
+                dx = coords[u, 0] - coords[v, 0]
+                dy = coords[u, 1] - coords[v, 1]
+                c += np.sqrt(dx * dx + dy * dy)
+            out[r] = c
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _matrix_kernel(edge_weight, flat, starts, lengths, out):
+        for r in prange(lengths.shape[0]):
+            c = 0.0
+            base = starts[r]
+            for k in range(lengths[r] - 1):
+                c += edge_weight[flat[base + k] - 1, flat[base + k + 1] - 1]
+            out[r] = c
+
+    # Rounded variants: every edge is rounded before summing, so no
+    # fastmath (it may reassociate and move a value across a .5 boundary)
+
+    @njit(parallel=True, cache=True)
+    def _euclidean_rounded_kernel(coords, flat, starts, lengths, out):
+        for r in prange(lengths.shape[0]):
+            c = 0
+            base = starts[r]
+            for k in range(lengths[r] - 1):
+                u = flat[base + k] - 1
+                v = flat[base + k + 1] - 1
+                c += np.int64(np.rint(np.hypot(coords[u, 0] - coords[v, 0],
+                                               coords[u, 1] - coords[v, 1])))
+            out[r] = c
+
+    @njit(parallel=True, cache=True)
+    def _matrix_rounded_kernel(edge_weight, flat, starts, lengths, out):
+        for r in prange(lengths.shape[0]):
+            c = 0
+            base = starts[r]
+            for k in range(lengths[r] - 1):
+                c += np.int64(np.rint(edge_weight[flat[base + k] - 1, flat[base + k + 1] - 1]))
+            out[r] = c
+
+
+def _run_kernel(kernel, data: np.ndarray, flat: np.ndarray, lengths: np.ndarray,
+                dtype=np.float64) -> List[float]:
+    starts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+
+    out = np.zeros(len(lengths), dtype=dtype)
+    kernel(data, flat, starts, lengths, out)
+    return out.tolist()
+
+
+# ------------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------------
+
+# Above this many nodes a dense matrix is not built (dim^2 * 8 bytes)
+DIST_MATRIX_MAX_DIM = 5000
+
+
+def euclidean_distance_matrix(coords) -> np.ndarray:
+    """Dense (n x n) float64 Euclidean distance matrix, row 0 = depot."""
+    coords = np.asarray(coords, dtype=np.float64)
+    x, y = coords[:, 0], coords[:, 1]
+
+    dist = np.subtract.outer(x, x)
+    return np.hypot(dist, np.subtract.outer(y, y), out=dist)
+
+
+def euclidean_costs_flat(coords, flat: np.ndarray, lengths: np.ndarray) -> List[float]:
+    """
+    Same as euclidean_route_costs, for routes already stored flat:
+    flat = concatenated node ids (any int dtype), lengths = nodes per route.
+    """
+    if not len(lengths):
+        return []
+
+    coords = np.ascontiguousarray(coords, dtype=np.float64)
+
+    if njit is not None:
+        return _run_kernel(_euclidean_kernel, coords, flat, lengths)
+
+    tails, heads, route_of_edge = _flatten_edges(flat, lengths)
+
+    delta = coords[heads] - coords[tails]
+    edge_len = np.hypot(delta[:, 0], delta[:, 1])
+
+    return np.bincount(
+        route_of_edge, weights=edge_len, minlength=len(lengths)
+    ).tolist()
+
+
+def matrix_costs_flat(edge_weight, flat: np.ndarray, lengths: np.ndarray) -> List[float]:
+    """Same as matrix_route_costs, for routes already stored flat."""
+    if not len(lengths):
+        return []
+
+    edge_weight = np.ascontiguousarray(edge_weight, dtype=np.float64)
+
+    if njit is not None:
+        return _run_kernel(_matrix_kernel, edge_weight, flat, lengths)
+
+    tails, heads, route_of_edge = _flatten_edges(flat, lengths)
+
+    return np.bincount(
+        route_of_edge, weights=edge_weight[tails, heads], minlength=len(lengths)
+    ).tolist()
+
+
+def euclidean_route_costs(coords, routes: Routes, *, round_edges: bool = False) -> List[float]:
+    """
+    Euclidean length of each route (0.0 for routes with < 2 nodes).
+
+    round_edges=True rounds every edge to the nearest integer before
+    summing (VRPLIB EUC_2D convention; ties to even, like Python's round())
+    and returns ints.
+    """
+    if not routes:
+        return []
+
+    if not round_edges:
+        return euclidean_costs_flat(coords, *_flatten_routes(routes))
+
+    if njit is not None:
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        return _run_kernel(_euclidean_rounded_kernel, coords, *_flatten_routes(routes), dtype=np.int64)
+
+    coords = np.asarray(coords, dtype=np.float64)
+    tails, heads, route_of_edge = _flatten_edges(*_flatten_routes(routes))
+
+    delta = coords[heads] - coords[tails]
+    edge_len = np.rint(np.hypot(delta[:, 0], delta[:, 1])).astype(np.int64)
+
+    return np.bincount(
+        route_of_edge, weights=edge_len, minlength=len(routes)
+    ).astype(np.int64).tolist()
+
+
+def matrix_route_costs(edge_weight, routes: Routes, *, round_edges: bool = False) -> List[float]:
+    """
+    Route lengths looked up in an explicit (n x n) edge weight matrix.
+
+    round_edges=True rounds every edge weight like euclidean_route_costs
+    and returns ints; an integer matrix (e.g. loader.rounded_edge_weights)
+    is gathered as is, without rounding or a float copy.
+    """
+    if not routes:
+        return []
+
+    if not round_edges:
+        return matrix_costs_flat(edge_weight, *_flatten_routes(routes))
+
+    edge_weight = np.asarray(edge_weight)
+    if not np.issubdtype(edge_weight.dtype, np.integer):
+        edge_weight = edge_weight.astype(np.float64, copy=False)
+
+    if njit is not None:
+        edge_weight = np.ascontiguousarray(edge_weight)
+        return _run_kernel(_matrix_rounded_kernel, edge_weight, *_flatten_routes(routes), dtype=np.int64)
+
+    tails, heads, route_of_edge = _flatten_edges(*_flatten_routes(routes))
+
+    edge_len = edge_weight[tails, heads]
+    if edge_len.dtype.kind == "f":
+        edge_len = np.rint(edge_len)
+    edge_len = edge_len.astype(np.int64)
+
+    return np.bincount(
+        route_of_edge, weights=edge_len, minlength=len(routes)
+    ).astype(np.int64).tolist()
+
+
+def compute_route_costs(instance: dict, routes: Routes) -> List[float]:
+    """
+    Route lengths for a loaded VRPLIB instance.
+
+    Uses the instance's edge_weight matrix when present (explicit weights,
+    or those precomputed by vrplib), otherwise node coordinates.
+    """
+    edge_mat = instance.get("edge_weight")
+    if edge_mat is not None:
+        return matrix_route_costs(edge_mat, routes)
+    return euclidean_route_costs(coords_array(instance), routes)
@@ -7,25 +7,121 @@ they do not change the optimal SCP solution.
 Currently implemented:
   1) Same customer set dominance (order ignored):
      keep only the cheapest route per customer set.
+  2) Subset dominance (covering only):
+     drop a route whose customer set is a proper subset of another
+     route's set that costs no more. Safe for SCP (>= 1) but NOT for set
+     partitioning (== 1), where the smaller route may be required.
 
-This filter SUBSUMES exact duplicate removal.
+Rule 1 SUBSUMES exact duplicate removal.
 """
 
 from __future__ import annotations
-from typing import List, Tuple, Dict, Iterable
+from itertools import chain
+from typing import List, Tuple, Dict, Iterable, Optional
+
+import numpy as np
 
 
 Route = List[int]
 Routes = List[Route]
 
+# Pools larger than this take the vectorized (Zobrist hash) path
+_NUMPY_MIN_POOL_SIZE = 2000
+
+# Routes per block of candidate superset pairs in subset_dominated
+_SUBSET_BLOCK = 4096
+
 
 # ------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------
 
-def _customer_set(route: Iterable[int], depot_id: int) -> frozenset[int]:
-    """Return customer set, ignoring depot and order."""
-    return frozenset(n for n in route if n != depot_id)
+def _customer_set(route: Iterable[int], depot_id: int) -> Tuple[int, ...]:
+    """
+    Return canonical customer set, ignoring depot and order.
+
+    Sorted tuple instead of frozenset: routes are short, so the sort is
+    cheap and tuples are lighter to build and hash than sets.
+    """
+    return tuple(sorted(n for n in route if n != depot_id))
+
+
+def _best_indices_python(
+    routes: Routes,
+    costs: List[float],
+    depot_id: int,
+) -> List[int]:
+    """Index of the cheapest route per customer set (pure Python)."""
+    # customer set -> (best cost, index)
+    best: Dict[Tuple[int, ...], Tuple[float, int]] = {}
+
+    # hot loop over the whole pool: bind lookups to locals
+    get = best.get
+
+    for i, (r, c) in enumerate(zip(routes, costs)):
+        key = _customer_set(r, depot_id)
+        cur = get(key)
+
+        if cur is None or c < cur[0]:  # strict: first of equal-cost wins
+            best[key] = (c, i)
+
+    return sorted(v[1] for v in best.values())
+
+
+def _best_indices_numpy(
+    routes: Routes,
+    costs: List[float],
+    depot_id: int,
+) -> Optional[List[int]]:
+    """
+    Vectorized variant of `_best_indices_python` for large pools.
+
+    Each customer set is hashed by XOR-ing random 64-bit Zobrist keys of
+    its customers. Routes are then sorted by (hash, cost, index) and the
+    first route of every hash group is kept, which reproduces the
+    "cheapest, first on ties" rule of the Python path.
+
+    Returns None if a hash collision is detected (groups whose routes
+    differ in size or customer-id sum); the caller then falls back to
+    the exact Python path.
+    """
+    n = len(routes)
+    lengths = np.fromiter((len(r) for r in routes), dtype=np.int64, count=n)
+    flat = np.fromiter(
+        chain.from_iterable(routes), dtype=np.int64, count=int(lengths.sum())
+    )
+    route_of = np.repeat(np.arange(n), lengths)
+
+    mask = flat != depot_id
+    flat = flat[mask]
+    route_of = route_of[mask]
+
+    size = np.bincount(route_of, minlength=n)
+    id_sum = np.bincount(route_of, weights=flat, minlength=n)
+
+    table_size = int(flat.max()) + 1 if flat.size else 1
+    zobrist = np.random.default_rng(0).integers(
+        np.iinfo(np.uint64).max, size=table_size, dtype=np.uint64
+    )
+    h = np.zeros(n, dtype=np.uint64)
+    np.bitwise_xor.at(h, route_of, zobrist[flat])
+
+    # lexsort is stable: equal (hash, cost) keep original index order
+    order = np.lexsort((np.asarray(costs, dtype=float), h))
+    h_sorted = h[order]
+    is_first = np.empty(n, dtype=bool)
+    is_first[0] = True
+    np.not_equal(h_sorted[1:], h_sorted[:-1], out=is_first[1:])
+
+    # representative (kept route) of each route's hash group, in sort order
+    rep = order[is_first][np.cumsum(is_first) - 1]
+    if (
+        np.any(size[order] != size[rep])
+        or np.any(id_sum[order] != id_sum[rep])
+    ):
+        return None
+
+    return np.sort(order[is_first]).tolist()
 
 
 # ------------------------------------------------------------------
@@ -40,16 +136,11 @@ def filter_same_customer_set_keep_cheapest(
 ) -> Tuple[Routes, List[float], Dict[int, int]]:
     assert len(routes) == len(costs)
 
-    best_idx: Dict[frozenset[int], int] = {}
-
-    for i, r in enumerate(routes):
-        key = _customer_set(r, depot_id)
-        prev = best_idx.get(key)
-
-        if prev is None or costs[i] < costs[prev]:
-            best_idx[key] = i
-
-    kept_old_indices = sorted(best_idx.values())
+    kept_old_indices = None
+    if len(routes) > _NUMPY_MIN_POOL_SIZE:
+        kept_old_indices = _best_indices_numpy(routes, costs, depot_id)
+    if kept_old_indices is None:
+        kept_old_indices = _best_indices_python(routes, costs, depot_id)
 
     filtered_routes = [routes[i] for i in kept_old_indices]
     filtered_costs = [costs[i] for i in kept_old_indices]
@@ -62,6 +153,125 @@ def filter_same_customer_set_keep_cheapest(
     return filtered_routes, filtered_costs, old_to_new
 
 
+# ------------------------------------------------------------------
+# Dominance rule 2: customer subset of a no more expensive route
+# ------------------------------------------------------------------
+
+def subset_dominated(
+    routes: Routes,
+    costs: List[float],
+    *,
+    depot_id: int = 1,
+) -> np.ndarray:
+    """
+    Boolean mask of routes dominated by rule 2, for a pool that already
+    passed rule 1 (no repeated customer sets).
+
+    Customer sets are packed into uint64 bitmasks; for each route only the
+    larger, no more expensive routes sharing its least frequent customer
+    are tested as supersets, by checking a's customers against b's bits,
+    all pairs of a block at once. Dominators are strictly larger, so the
+    relation has no cycles and a maximal route always survives.
+    """
+    n = len(routes)
+    lengths = np.fromiter((len(r) for r in routes), dtype=np.int64, count=n)
+    flat = np.fromiter(
+        chain.from_iterable(routes), dtype=np.int64, count=int(lengths.sum())
+    )
+    route_of = np.repeat(np.arange(n), lengths)
+
+    mask = flat != depot_id
+    flat = flat[mask]
+    route_of = route_of[mask]
+
+    # compact customer ids -> bit positions
+    _, pos = np.unique(flat, return_inverse=True)
+    n_cust = int(pos.max()) + 1 if pos.size else 0
+
+    masks = np.zeros((n, (n_cust + 63) // 64), dtype=np.uint64)
+    np.bitwise_or.at(
+        masks, (route_of, pos >> 6), np.left_shift(np.uint64(1), (pos & 63).astype(np.uint64))
+    )
+    size = np.bincount(route_of, minlength=n)
+    starts = np.concatenate(([0], np.cumsum(size)))
+
+    costs_arr = np.asarray(costs, dtype=float)
+    cost_rank = np.unique(costs_arr, return_inverse=True)[1]  # ties share a rank
+
+    # inverted index: routes visiting each customer, cheapest first, so the
+    # no more expensive candidates of a route are a prefix of each list
+    order = np.lexsort((cost_rank[route_of], pos))
+    by_cust = route_of[order]
+    by_key = pos[order] * n + cost_rank[by_cust]
+    cust_ptr = np.concatenate(([0], np.cumsum(np.bincount(pos, minlength=n_cust))))
+    degree = np.diff(cust_ptr)
+
+    dominated = np.zeros(n, dtype=bool)
+
+    # empty set: within any visiting route
+    empty = size == 0
+    if empty.any():
+        cheapest = costs_arr[~empty].min() if (~empty).any() else np.inf
+        dominated[empty] = costs_arr[empty] >= cheapest
+
+    # least frequent customer of each non-empty route (reduceat over its bits)
+    routes_nz = np.flatnonzero(~empty)
+    key = degree[pos] * n_cust + pos
+    rarest = np.minimum.reduceat(key, starts[routes_nz]) % n_cust if pos.size else pos
+
+    # (route, candidate superset) pairs, generated in blocks to bound memory
+    for lo in range(0, len(routes_nz), _SUBSET_BLOCK):
+        a = routes_nz[lo:lo + _SUBSET_BLOCK]
+        c = rarest[lo:lo + _SUBSET_BLOCK]
+        deg = np.searchsorted(by_key, c * n + cost_rank[a], side="right") - cust_ptr[c]
+
+        offsets = np.repeat(cust_ptr[c] - np.cumsum(deg) + deg, deg)
+        b = by_cust[np.arange(int(deg.sum())) + offsets]
+        a = np.repeat(a, deg)
+
+        ok = size[b] > size[a]
+        a, b = a[ok], b[ok]
+
+        # test a's customers one at a time against b's bits; nearly all
+        # pairs fail within the first couple of customers
+        k = 0
+        while len(a):
+            done = size[a] == k
+            dominated[a[done]] = True
+            a, b = a[~done], b[~done]
+
+            p = pos[starts[a] + k]
+            word = masks[b, p >> 6] >> (p & 63).astype(np.uint64)
+            hit = (word & np.uint64(1)).astype(bool)
+            a, b = a[hit], b[hit]
+            k += 1
+
+    return dominated
+
+
+def scp_kept_indices(
+    routes: Routes,
+    costs: List[float],
+    *,
+    depot_id: int = 1,
+) -> List[int]:
+    """
+    Indices (ascending) of the routes that survive rules 1 and 2, i.e. the
+    reduced pool an SCP solver can work on without changing its optimum.
+    Selected indices map back to the original pool as kept[i].
+    """
+    kept = None
+    if len(routes) > _NUMPY_MIN_POOL_SIZE:
+        kept = _best_indices_numpy(routes, costs, depot_id)
+    if kept is None:
+        kept = _best_indices_python(routes, costs, depot_id)
+
+    dominated = subset_dominated(
+        [routes[i] for i in kept], [costs[i] for i in kept], depot_id=depot_id
+    )
+    return [i for i, d in zip(kept, dominated.tolist()) if not d]
+
+
 # ------------------------------------------------------------------
 # Public pool-level API (THIS is what DRSCI should call)
 # ------------------------------------------------------------------
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any, Tuple
-from collections import Counter, defaultdict
+from typing import List, Dict, Any, Tuple, Optional, FrozenSet
+import heapq
+from itertools import chain
+
+import numpy as np
 
 Route = List[int]
-RouteKey = Tuple[int, ...]
+RouteKey = FrozenSet[int]
 Tag = Dict[str, Any]
+Edge = Tuple[int, int]
+# (pool index, route, tag or None if not looked up yet)
+Candidate = Tuple[int, Route, Optional[Tag]]
+
+# Canonical form of the routes of the last filtered pool:
+#   id(route) -> (route, depot_id, customers, key)
+_ROUTE_KEY_CACHE: Dict[int, Tuple[Route, int, List[int], RouteKey]] = {}
 
 
 def _route_badness(
@@ -35,6 +45,108 @@ def _route_badness(
     return badness
 
 
+def _route_badness_array(
+    *,
+    utilization: np.ndarray,
+    length: np.ndarray,
+    from_scp: np.ndarray,
+    in_best: np.ndarray,
+    age: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized `_route_badness` over parallel per-route arrays.
+    Terms are added in the same order, so values match the scalar version.
+    """
+    length = np.maximum(length, 1)
+    utilization = np.clip(utilization, 0.0, 1.0)
+
+    badness = 2.0 * (1.0 - utilization)      # low utilization
+    badness += 1.0 / length                  # short routes
+    badness += np.where(in_best, 0.0, 2.5)
+    badness += np.where(from_scp, 0.0, 2.0)
+    badness += 0.1 * age
+
+    return badness
+
+
+def _canonical_routes(
+    routes: List[Route],
+    depot_id: int,
+) -> Tuple[Dict[int, List[int]], Dict[int, RouteKey]]:
+    """
+    Customers (depot stripped) and tag key of every route, indexed like the pool.
+
+    Results are cached in _ROUTE_KEY_CACHE by route object identity, so
+    routes that stay in the pool are canonicalized only once. Relies on
+    pool routes never being mutated in place. The cache is rebuilt on each
+    call and only holds the current pool, so dropped routes are released.
+    """
+    global _ROUTE_KEY_CACHE
+    old_cache = _ROUTE_KEY_CACHE
+    new_cache = {}
+
+    route_customers: Dict[int, List[int]] = {}
+    route_keys: Dict[int, RouteKey] = {}
+
+    for idx, r in enumerate(routes):
+        entry = old_cache.get(id(r))
+        # entry holds the route itself, so a reused id() can't alias
+        if entry is None or entry[0] is not r or entry[1] != depot_id:
+            customers = [c for c in r if c != depot_id]
+            entry = (r, depot_id, customers, frozenset(customers))
+        new_cache[id(r)] = entry
+        route_customers[idx] = entry[2]
+        route_keys[idx] = entry[3]
+
+    _ROUTE_KEY_CACHE = new_cache
+    return route_customers, route_keys
+
+
+def _route_utilizations(
+    route_customers: Dict[int, List[int]],
+    demand: List[int],
+    capacity: float,
+) -> List[float]:
+    """
+    Utilization (load / capacity) of every route, indexed like the pool.
+
+    All routes are flattened into one customer array so the demand gather
+    and per-route sum run in NumPy instead of one Python sum per route.
+    """
+    n = len(route_customers)
+    lengths = np.fromiter(
+        (len(c) for c in route_customers.values()), dtype=np.int64, count=n
+    )
+    flat = np.fromiter(
+        chain.from_iterable(route_customers.values()),
+        dtype=np.int64,
+        count=int(lengths.sum()),
+    )
+    route_of = np.repeat(np.arange(n), lengths)
+
+    demand_arr = np.asarray(demand, dtype=np.float64)
+    loads = np.bincount(route_of, weights=demand_arr[flat - 1], minlength=n)
+
+    return (loads / capacity).tolist()
+
+
+def _incumbent_edges(
+    route_tags: Dict[RouteKey, Tag],
+    depot_id: int,
+) -> FrozenSet[Edge]:
+    """
+    Edge set of all routes tagged "in_best".
+    """
+    best_edges = set()
+    for key, tag in route_tags.items():
+        if tag.get("in_best", False):
+            # keys are unordered; edges need the tagged visiting order
+            ordered = tag.get("customers_ordered", tuple(key))
+            route = [depot_id, *ordered, depot_id]
+            best_edges.update(zip(route, route[1:]))
+    return frozenset(best_edges)
+
+
 def _ensure_coverage(
     *,
     kept_routes: List[Route],
@@ -45,24 +157,30 @@ def _ensure_coverage(
     """
     Hard safety net: ensure every customer appears in at least one route.
     """
-    covered = set()
-    for r in kept_routes:
-        covered.update(c for c in r if c != depot_id)
+    covered = set(chain.from_iterable(kept_routes))
+    covered.discard(depot_id)
 
     missing = [c for c in customers if c not in covered]
     if not missing:
         return kept_routes
 
-    by_customer = defaultdict(list)
+    # first route (in pool order) covering each missing customer;
+    # only missing customers are indexed, stop once all are found
+    to_find = set(missing)
+    to_find.discard(depot_id)
+    first_cover: Dict[int, Route] = {}
     for r in all_routes:
-        custs = [c for c in r if c != depot_id]
-        for c in custs:
-            by_customer[c].append(r)
+        for c in r:
+            if c in to_find and c not in first_cover:
+                first_cover[c] = r
+        if len(first_cover) == len(to_find):
+            break
 
     repaired = list(kept_routes)
     for c in missing:
-        if by_customer[c]:
-            repaired.append(by_customer[c][0])
+        r = first_cover.get(c)
+        if r is not None:
+            repaired.append(r)
         else:
             # last-resort singleton route
             repaired.append([depot_id, c, depot_id])
@@ -87,7 +205,7 @@ def _rank_by_quality(
         utilization = load / capacity
         length = len(customers)
 
-        tag = route_tags.get(tuple(customers), {})
+        tag = route_tags.get(frozenset(customers), {})
         badness = _route_badness(
             utilization=utilization,
             length=length,
@@ -107,10 +225,7 @@ def _rank_by_diversity(
     depot_id: int,
 ) -> List[Tuple[int, Route, float]]:
     def edges(route):
-        return {
-            (route[i], route[i + 1])
-            for i in range(len(route) - 1)
-        }
+        return set(zip(route, route[1:]))
 
     best_edges = set()
     for r in best_routes:
@@ -127,6 +242,81 @@ def _rank_by_diversity(
     # LOWER overlap = better → remove worst first
     return sorted(ranked, key=lambda x: x[2], reverse=True)
 
+def _classify_routes(
+    *,
+    routes: List[Route],
+    route_customers: Dict[int, List[int]],
+    route_keys: Dict[int, RouteKey],
+    route_utilization: List[float],
+    route_tags: Dict[RouteKey, Tag],
+    min_utilization: float,
+    elite_iteration_threshold: int,
+    elite_possible: bool,
+) -> Tuple[List[Route], List[Candidate], List[int]]:
+    """
+    Step A of filter_route_pool_for_scp: split the pool into elites and
+    removable candidates; routes failing the filters are dropped.
+
+    Pure function of its inputs (route_tags is only read), routes are
+    visited in pool order. Returns (elite_routes, candidates,
+    eligible_customers), the last being the flattened customers of all
+    elites and candidates. Candidates carry the tag found during
+    classification so ranking does not look it up again.
+    """
+    elite_routes: List[Route] = []
+    candidates: List[Candidate] = []
+
+    # customers of all surviving routes (elites + candidates), flattened
+    eligible_customers: List[int] = []
+
+    # numeric filters (utilization, length) as one vectorized mask
+    lengths = np.fromiter(
+        (len(c) for c in route_customers.values()),
+        dtype=np.int64,
+        count=len(route_customers),
+    )
+    passes = (np.asarray(route_utilization) >= min_utilization) & (lengths >= 2)
+
+    if not elite_possible:
+        # no tag can rescue a filtered route: candidates follow from the mask
+        for idx in np.flatnonzero(passes).tolist():
+            candidates.append((idx, routes[idx], None))
+            eligible_customers.extend(route_customers[idx])
+        return elite_routes, candidates, eligible_customers
+
+    passes_list = passes.tolist()
+
+    for idx, r in enumerate(routes):
+        customers = route_customers[idx]
+        if not customers:
+            continue
+
+        fails_filters = not passes_list[idx]
+
+        tag = route_tags.get(route_keys[idx], {})
+
+        stage = tag.get("stage")
+        iteration = tag.get("iteration", 0)
+
+        is_elite = (
+            stage in {"scp_post_ls", "final_scp_post_ls"}
+            and iteration >= elite_iteration_threshold
+        )
+
+        if is_elite:
+            elite_routes.append(r)
+            eligible_customers.extend(customers)
+            continue
+
+        if fails_filters:
+            continue
+
+        candidates.append((idx, r, tag))
+        eligible_customers.extend(customers)
+
+    return elite_routes, candidates, eligible_customers
+
+
 def filter_route_pool_for_scp(
     *,
     routes: List[Route],
@@ -149,6 +339,9 @@ def filter_route_pool_for_scp(
 
     POLICY:
     - If len(routes) <= max_routes: return routes unchanged
+    - If only marginally above the cap (<= max(16, 5% of max_routes)),
+      in "quality" mode and with a pool too small for elites:
+        drop the lowest-utilization routes, then coverage repair
     - Otherwise:
         Step A: safety, elites, utilization
         Step B: rank removable routes according to pruning_mode
@@ -170,54 +363,52 @@ def filter_route_pool_for_scp(
     # --------------------------------------------------
     # Precompute customers per route
     # --------------------------------------------------
-    route_customers: Dict[int, List[int]] = {
-        idx: [c for c in r if c != depot_id]
-        for idx, r in enumerate(routes)
-    }
+    route_customers, route_keys = _canonical_routes(routes, depot_id)
+
+    route_utilization = _route_utilizations(route_customers, demand, capacity)
 
     # --------------------------------------------------
     # Elite maturity threshold
     # --------------------------------------------------
     elite_iteration_threshold = elite_after_scp_rounds * scp_every
-
-    elite_routes: List[Route] = []
-    candidates: List[Tuple[int, Route]] = []
+    elite_possible = pool_size >= min_pool_size_for_elite
 
     # --------------------------------------------------
-    # Step A: classify routes (NO ranking yet)
+    # FAST PATH: marginally above cap
     # --------------------------------------------------
-    for idx, r in enumerate(routes):
-        customers = route_customers[idx]
-        if not customers:
-            continue
-
-        load = sum(demand[c - 1] for c in customers)
-        utilization = load / capacity
-        length = len(customers)
-
-        key = tuple(customers)
-        tag = route_tags.get(key, {})
-
-        stage = tag.get("stage")
-        iteration = tag.get("iteration", 0)
-
-        is_elite = (
-            stage in {"scp_post_ls", "final_scp_post_ls"}
-            and iteration >= elite_iteration_threshold
-            and pool_size >= min_pool_size_for_elite
+    # Only where it cannot contradict the full policy: with elites possible
+    # it could drop a mature elite, and other modes rank differently.
+    n_drop = pool_size - max_routes
+    if (
+        pruning_mode == "quality"
+        and not elite_possible
+        and n_drop <= max(16, 0.05 * max_routes)
+    ):
+        dropped = {
+            idx for _, idx in heapq.nsmallest(
+                n_drop, zip(route_utilization, range(pool_size))
+            )
+        }
+        return _ensure_coverage(
+            kept_routes=[r for idx, r in enumerate(routes) if idx not in dropped],
+            all_routes=routes,
+            depot_id=depot_id,
+            customers=all_customers,
         )
 
-        if is_elite:
-            elite_routes.append(r)
-            continue
-
-        if utilization < min_utilization:
-            continue
-
-        if length < 2:
-            continue
-
-        candidates.append((idx, r))
+    # --------------------------------------------------
+    # Step A: classify routes (NO ranking yet)
+    # --------------------------------------------------
+    elite_routes, candidates, eligible_customers = _classify_routes(
+        routes=routes,
+        route_customers=route_customers,
+        route_keys=route_keys,
+        route_utilization=route_utilization,
+        route_tags=route_tags,
+        min_utilization=min_utilization,
+        elite_iteration_threshold=elite_iteration_threshold,
+        elite_possible=elite_possible,
+    )
 
     # --------------------------------------------------
     # Elites alone exceed cap
@@ -230,8 +421,11 @@ def filter_route_pool_for_scp(
     # --------------------------------------------------
     # Coverage over eligible routes
     # --------------------------------------------------
-    eligible = elite_routes + [r for _, r in candidates]
-    coverage = Counter(c for r in eligible for c in r if c != depot_id)
+    # dense customer ids -> flat count list indexed by customer id
+    coverage: List[int] = np.bincount(
+        np.asarray(eligible_customers, dtype=np.int64),
+        minlength=len(demand) + 1,
+    ).tolist()
 
     # --------------------------------------------------
     # Step B: ranking strategy
@@ -239,40 +433,50 @@ def filter_route_pool_for_scp(
     ranked: List[Tuple[int, Route, float]] = []
 
     if pruning_mode == "none":
-        ranked = [(idx, r, 0.0) for idx, r in candidates]
+        ranked = [(idx, r, 0.0) for idx, r, _ in candidates]
 
     elif pruning_mode == "quality":
-        for idx, r in candidates:
-            customers = route_customers[idx]
-            load = sum(demand[c - 1] for c in customers)
-            utilization = load / capacity
-            length = len(customers)
-
-            tag = route_tags.get(tuple(customers), {})
-            badness = _route_badness(
-                utilization=utilization,
-                length=length,
-                from_scp=tag.get("stage") in {"scp_post_ls", "final_scp_post_ls"},
-                in_best=tag.get("in_best", False),
-                age=max(0, tag.get("iteration", 0)),
-            )
-            ranked.append((idx, r, badness))
+        n_cand = len(candidates)
+        from_scp = np.zeros(n_cand, dtype=bool)
+        in_best = np.zeros(n_cand, dtype=bool)
+        age = np.zeros(n_cand, dtype=np.int64)
+
+        for i, (idx, _, tag) in enumerate(candidates):
+            if tag is None:
+                tag = route_tags.get(route_keys[idx], {})
+            from_scp[i] = tag.get("stage") in {"scp_post_ls", "final_scp_post_ls"}
+            in_best[i] = bool(tag.get("in_best", False))
+            age[i] = max(0, tag.get("iteration", 0))
+
+        badness = _route_badness_array(
+            utilization=np.fromiter(
+                (route_utilization[idx] for idx, _, _ in candidates),
+                dtype=np.float64,
+                count=n_cand,
+            ),
+            length=np.fromiter(
+                (len(route_customers[idx]) for idx, _, _ in candidates),
+                dtype=np.int64,
+                count=n_cand,
+            ),
+            from_scp=from_scp,
+            in_best=in_best,
+            age=age,
+        )
 
-        # worst first
-        ranked.sort(key=lambda x: x[2], reverse=True)
+        # worst first (stable, like list.sort(reverse=True))
+        order = np.argsort(-badness, kind="stable")
+        ranked = [
+            (candidates[i][0], candidates[i][1], float(badness[i]))
+            for i in order.tolist()
+        ]
 
     elif pruning_mode == "diversity":
-        # Build edge set of current incumbent
-        best_edges = set()
-        for key, tag in route_tags.items():
-            if tag.get("in_best", False):
-                route = [depot_id, *key, depot_id]
-                best_edges |= {
-                    (route[i], route[i + 1]) for i in range(len(route) - 1)
-                }
-
-        for idx, r in candidates:
-            edges = {(r[i], r[i + 1]) for i in range(len(r) - 1)}
+        # Edge set of current incumbent
+        best_edges = _incumbent_edges(route_tags, depot_id)
+
+        for idx, r, _ in candidates:
+            edges = set(zip(r, r[1:]))
             overlap = (
                 len(edges & best_edges) / max(len(edges), 1)
                 if best_edges else 0.0
@@ -289,11 +493,13 @@ def filter_route_pool_for_scp(
     # Coverage-safe truncation
     # --------------------------------------------------
     kept: List[Route] = []
+    kept_idx: set[int] = set()
     local_coverage = coverage.copy()
 
     for idx, r, _ in ranked:
         customers = route_customers[idx]
-        can_remove = all(local_coverage[c] > 1 for c in customers)
+        # candidates are never empty (length >= 2), so min() is safe
+        can_remove = min(map(local_coverage.__getitem__, customers)) > 1
 
         if can_remove:
             for c in customers:
@@ -301,6 +507,7 @@ def filter_route_pool_for_scp(
             continue
 
         kept.append(r)
+        kept_idx.add(idx)
         if len(kept) >= remaining_slots:
             break
 
@@ -308,9 +515,10 @@ def filter_route_pool_for_scp(
     # Deterministic fill if needed
     # --------------------------------------------------
     if len(kept) < remaining_slots:
-        for _, r, _ in ranked:
-            if r not in kept:
+        for idx, r, _ in ranked:
+            if idx not in kept_idx:
                 kept.append(r)
+                kept_idx.add(idx)
             if len(kept) >= remaining_slots:
                 break
 
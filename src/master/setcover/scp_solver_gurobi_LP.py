@@ -23,11 +23,23 @@ Returns the same output schema as the MIP solver so the caller can swap modules
 
 from __future__ import annotations
 
+import heapq
 import math
-from typing import List, Dict, Optional, Set
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import List, Dict, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the heap-based NumPy path is used instead
+    njit = None
 
 try:
-    from gurobipy import Model, GRB, quicksum
+    from gurobipy import Model, GRB
 except ImportError as e:
     raise ImportError(
         "gurobipy is required for SCP solving. "
@@ -36,7 +48,9 @@ except ImportError as e:
         "See https://www.gurobi.com/ for more information."
     ) from e
 
-from master.utils.loader import load_instance
+from master.utils.loader import coords_array, load_instance
+from master.setcover.route_costs import euclidean_route_costs
+from master.setcover.route_dominance_filter import scp_kept_indices
 
 
 def _compute_route_costs(instance: dict, routes: List[List[int]]) -> List[float]:
@@ -47,31 +61,233 @@ def _compute_route_costs(instance: dict, routes: List[List[int]]) -> List[float]
         - instance["node_coord"][0] = coordinates of node 1 (depot)
         - routes are given as node IDs, e.g. [1, 5, 23, 1]
     """
-    coords = instance["node_coord"]  # shape (n, 2), index 0 -> node 1
+    return euclidean_route_costs(coords_array(instance), routes)
+
+
+def _pack_customers(customers: List[int], n_words: int) -> np.ndarray:
+    """(W,) uint64 bitmask with bit i - 2 set for every customer i."""
+    pos = np.asarray(customers, dtype=np.int64) - 2
+    mask = np.zeros(n_words, dtype=np.uint64)
+    np.bitwise_or.at(mask, pos >> 6, np.left_shift(np.uint64(1), (pos & 63).astype(np.uint64)))
+    return mask
+
+
+def _coverage_index(
+    routes: List[List[int]], dim: int
+) -> Tuple[np.ndarray, Dict[int, np.ndarray], sp.csr_matrix]:
+    """
+    Coverage structures of a route pool, built from one flat pass:
+
+      masks       : (R, W) uint64, W = ceil((dim - 1) / 64); bit i - 2 of
+                    row r is set iff route r visits customer i
+      cust_routes : customer i -> ascending indices of routes visiting i
+      A           : sparse (customers x routes) 0/1 matrix, row k = customer k + 2
+
+    Node IDs that are not customers of the instance (depot, out of range)
+    are ignored; a customer visited twice by a route counts once.
+    """
+    n_routes = len(routes)
+    lengths = np.fromiter(map(len, routes), dtype=np.int64, count=n_routes)
+    flat = np.fromiter(chain.from_iterable(routes), dtype=np.int64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(n_routes), lengths)
+
+    valid = (flat >= 2) & (flat <= dim)
+
+    # unique (customer, route) pairs, sorted by customer then route
+    pairs = np.unique(flat[valid] * n_routes + rows[valid])
+    pos, rows = pairs // n_routes - 2, pairs % n_routes
 
-    def dist(u: int, v: int) -> float:
-        x1, y1 = coords[u - 1]
-        x2, y2 = coords[v - 1]
-        return math.hypot(x2 - x1, y2 - y1)
+    masks = np.zeros((n_routes, (dim + 62) // 64), dtype=np.uint64)
+    np.bitwise_or.at(masks, (rows, pos >> 6), np.left_shift(np.uint64(1), (pos & 63).astype(np.uint64)))
+
+    indptr = np.searchsorted(pos, np.arange(dim))
+    cust_routes = {k + 2: rows[indptr[k]:indptr[k + 1]] for k in range(dim - 1)}
+
+    A = sp.csr_matrix((np.ones(len(rows)), rows, indptr), shape=(dim - 1, n_routes))
+    return masks, cust_routes, A
+
+
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words)
+else:
+    _POPCOUNT_LUT = np.array([bin(b).count("1") for b in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        counts = _POPCOUNT_LUT[words.view(np.uint8)]
+        return counts.reshape(*words.shape, 8).sum(axis=-1)
+
+
+def _new_counts(masks: np.ndarray, uncovered: np.ndarray) -> np.ndarray:
+    """Number of still-uncovered customers each route would cover."""
+    return _popcount(masks & uncovered).sum(axis=1, dtype=np.int64)
+
+
+def _uncovered_customers(uncovered: np.ndarray) -> List[int]:
+    """Customer IDs whose bit is set in the (W,) mask."""
+    bits = np.unpackbits(uncovered.astype("<u8").view(np.uint8), bitorder="little")
+    return (np.flatnonzero(bits) + 2).tolist()
+
+
+def _candidates(
+    cust_routes: Dict[int, np.ndarray], uncovered: np.ndarray, n_routes: int
+) -> np.ndarray:
+    """
+    Sorted indices of the routes visiting at least one uncovered customer.
 
-    costs: List[float] = []
-    for route in routes:
-        if len(route) < 2:
-            costs.append(0.0)
+    Marked in a boolean (n_routes,) array instead of np.unique on the
+    concatenated lists: no sort, ~20x faster on large pools.
+    """
+    ids = _uncovered_customers(uncovered)
+    member = np.zeros(n_routes, dtype=bool)
+    if ids:
+        member[np.concatenate([cust_routes[i] for i in ids])] = True
+    return np.flatnonzero(member)
+
+
+# ------------------------------------------------------------------
+# Numba kernel (optional)
+# ------------------------------------------------------------------
+
+if njit is not None:
+
+    _M1 = np.uint64(0x5555555555555555)
+    _M2 = np.uint64(0x3333333333333333)
+    _M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+    _H01 = np.uint64(0x0101010101010101)
+
+    @njit(cache=True)
+    def _popcount64(x):
+        # SWAR popcount; LLVM lowers this pattern to a single ctpop
+        x = x - ((x >> np.uint64(1)) & _M1)
+        x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+        x = (x + (x >> np.uint64(4))) & _M4
+        return (x * _H01) >> np.uint64(56)
+
+    # no fastmath: scores must compare exactly like the Python path.
+    #
+    # Candidates are scanned in index order without a lower-bound cut-off.
+    # Visiting them by cost / size and stopping once that bound exceeds the
+    # best score was measured slower (X-n1001, 30k routes: rounding +15%,
+    # LNS +35%): late in a repair the best score is far above most bounds,
+    # so the scan rarely stops early, while the routes past the cut are
+    # no longer dropped and the bound order scatters the row accesses.
+    @njit(cache=True, nogil=True)
+    def _greedy_kernel(masks, costs, uncovered, cand, picks, scores, news):
+        n_words = masks.shape[1]
+        n_cand = cand.shape[0]
+        n_picks = 0
+
+        while True:
+            left = False
+            for w in range(n_words):
+                if uncovered[w]:
+                    left = True
+                    break
+            if not left:
+                break
+
+            best_r = -1
+            best_score = np.inf
+            best_new = 0
+            kept = 0
+            for k in range(n_cand):
+                r = cand[k]
+                cnt = 0
+                for w in range(n_words):
+                    cnt += _popcount64(masks[r, w] & uncovered[w])
+                if cnt == 0:
+                    continue
+
+                # drop routes that cover nothing new, as in _greedy_picks
+                cand[kept] = r
+                kept += 1
+                score = costs[r] / cnt
+                if score < best_score:
+                    best_score = score
+                    best_r = r
+                    best_new = cnt
+            n_cand = kept
+
+            if best_r < 0:
+                break
+
+            for w in range(n_words):
+                uncovered[w] &= ~masks[best_r, w]
+            picks[n_picks] = best_r
+            scores[n_picks] = best_score
+            news[n_picks] = best_new
+            n_picks += 1
+
+        return n_picks
+
+
+def _greedy_picks(
+    masks: np.ndarray,
+    cust_routes: Dict[int, np.ndarray],
+    costs: np.ndarray,
+    uncovered: np.ndarray,
+    cand: np.ndarray,
+):
+    """
+    Greedy SCP completion over the candidate routes cand: yields
+    (route, score, newly covered) for each route picked by minimum
+    cost / newly covered (lowest index on ties) and clears its customers
+    from uncovered in place. Stops when uncovered is empty or no
+    candidate covers anything new.
+
+    Scores live in a lazy min-heap: a route's score only grows as customers
+    get covered, so a popped entry whose recomputed score is unchanged is
+    the true minimum, and stale entries are pushed back re-scored.
+
+    Newly-covered counts are computed once for all candidates (one masked
+    popcount pass) and then kept current by decrementing the routes of each
+    customer that gets covered, so re-scoring a popped route is a lookup.
+
+    If numba is installed the whole completion runs in _greedy_kernel
+    instead (same picks, compiled candidate scan).
+    """
+    if njit is not None:
+        n_max = int(_popcount(uncovered).sum())
+        picks = np.empty(n_max, dtype=np.int64)
+        scores = np.empty(n_max, dtype=np.float64)
+        news = np.empty(n_max, dtype=np.int64)
+        n_picks = _greedy_kernel(masks, costs, uncovered, cand.copy(), picks, scores, news)
+        yield from zip(picks[:n_picks].tolist(), scores[:n_picks].tolist(), news[:n_picks].tolist())
+        return
+
+    counts = np.zeros(len(masks), dtype=np.int64)
+    counts[cand] = _new_counts(masks[cand], uncovered)
+    cand = cand[counts[cand] > 0]
+
+    heap = list(zip((costs[cand] / counts[cand]).tolist(), cand.tolist()))
+    heapq.heapify(heap)
+
+    while heap and uncovered.any():
+        score, r = heap[0]
+        new = int(counts[r])
+        if new == 0:
+            heapq.heappop(heap)
+            continue
+
+        fresh = costs[r] / new
+        if fresh != score:
+            heapq.heapreplace(heap, (fresh, r))
             continue
-        c = 0.0
-        for u, v in zip(route, route[1:]):
-            c += dist(u, v)
-        costs.append(c)
 
-    return costs
+        heapq.heappop(heap)
+        for i in _uncovered_customers(masks[r] & uncovered):
+            counts[cust_routes[i]] -= 1
+        uncovered &= ~masks[r]
+        yield r, score, new
 
 
 def _greedy_rounding(
     customers: List[int],
-    route_cust: List[Set[int]],
+    masks: np.ndarray,
+    cust_routes: Dict[int, np.ndarray],
     costs: List[float],
-    x_vals: Dict[int, float],
+    x_vals: np.ndarray,
     verbose: bool = False,
     take_threshold: float = 0.999,
 ) -> List[int]:
@@ -83,76 +299,64 @@ def _greedy_rounding(
       2) while some customers uncovered:
            pick route minimizing cost / newly_covered
 
+    masks is the packed route coverage from _coverage_index, cust_routes
+    the inverted index (customer -> routes) used to find candidates and
+    x_vals the LP solution as an array indexed by route.
+
     Returns:
       list of selected route indices
     """
-    all_customers: Set[int] = set(customers)
-
-    selected: Set[int] = set()
-    covered: Set[int] = set()
+    n_customers = len(customers)
+    all_customers = _pack_customers(customers, masks.shape[1])
+    costs_arr = np.asarray(costs, dtype=np.float64)
 
     # 1) Take almost-integer routes first
-    for r, val in x_vals.items():
-        if val >= take_threshold:
-            selected.add(r)
-            covered |= route_cust[r]
+    preselected = np.flatnonzero(x_vals >= take_threshold)
+    selected: Set[int] = set(preselected.tolist())
+    covered = np.bitwise_or.reduce(masks[preselected], axis=0, initial=np.uint64(0))
 
-    uncovered = all_customers - covered
+    uncovered = all_customers & ~covered
     if verbose:
         print(f"[SCP-LP] Rounding: preselected {len(selected)} routes, "
-              f"covered {len(covered)}/{len(all_customers)} customers.")
-
-    # 2) Greedy completion
-    #    (Iterate over all routes; if you ever need speed, add candidate filtering here.)
-    num_routes = len(route_cust)
-
-    while uncovered:
-        best_r: Optional[int] = None
-        best_score = float("inf")
-        best_new = 0
-
-        for r in range(num_routes):
-            if r in selected:
-                continue
-            newly = uncovered & route_cust[r]
-            if not newly:
-                continue
-
-            # cost effectiveness for remaining uncovered
-            score = costs[r] / len(newly)
-            if score < best_score:
-                best_score = score
-                best_r = r
-                best_new = len(newly)
-
-        if best_r is None:
-            # This should not happen if the pool covers all customers (we check earlier),
-            # but keep it robust anyway.
-            raise RuntimeError(
-                "[SCP-LP] Greedy rounding failed: no route covers remaining uncovered customers. "
-                f"Remaining uncovered count: {len(uncovered)}"
-            )
+              f"covered {int(_popcount(covered).sum())}/{n_customers} customers.")
+
+    # 2) Greedy completion over the routes touching uncovered customers
+    #    (selected routes cover nothing new, so they never win again)
+    cand = _candidates(cust_routes, uncovered, masks.shape[0])
 
+    for best_r, best_score, best_new in _greedy_picks(masks, cust_routes, costs_arr, uncovered, cand):
         selected.add(best_r)
-        covered |= route_cust[best_r]
-        uncovered = all_customers - covered
+        covered |= masks[best_r]
 
         if verbose:
             print(f"[SCP-LP] Rounding: add route {best_r} "
                   f"(newly covered={best_new}, score={best_score:.4f}). "
-                  f"Covered {len(covered)}/{len(all_customers)}.")
+                  f"Covered {int(_popcount(covered).sum())}/{n_customers}.")
+
+    if uncovered.any():
+        # This should not happen if the pool covers all customers (we check earlier),
+        # but keep it robust anyway.
+        raise RuntimeError(
+            "[SCP-LP] Greedy rounding failed: no route covers remaining uncovered customers. "
+            f"Remaining uncovered count: {int(_popcount(uncovered).sum())}"
+        )
 
     return sorted(selected)
 
 def _lns_scp_improve(
     *,
     customers: List[int],
-    route_cust: List[Set[int]],
+    masks: np.ndarray,
+    cust_routes: Dict[int, np.ndarray],
     costs: List[float],
     initial_selected: List[int],
     max_iters: int = 20,
     destroy_frac: float = 0.3,
     seed: int = 0,
+    restarts: int = 1,
+    t0: float = 0.0,
+    t_min: float = 1e-3,
+    alpha: float = 0.95,
     verbose: bool = False,
 ) -> List[int]:
     """
@@ -164,20 +368,63 @@ def _lns_scp_improve(
       - greedily repair uncovered customers
       - accept if improved
 
+    With t0 > 0, worse repairs are also accepted as the current solution
+    with probability exp((current_cost - new_cost) / T) (simulated
+    annealing, T = t0 * alpha^iter, plain descent once T < t_min); the
+    best solution seen is returned. t0 = 0 keeps strict improvement.
+
+    With restarts > 1, that many independent LNS runs (seeds seed,
+    seed + 1, ...) start from initial_selected in parallel threads and
+    the cheapest result wins (lowest seed on ties). The repair kernel
+    releases the GIL, so this scales with cores when numba is installed.
+
     Returns:
         improved list of selected route indices
     """
+    kwargs = dict(
+        customers=customers, masks=masks, cust_routes=cust_routes, costs=costs,
+        initial_selected=initial_selected, max_iters=max_iters,
+        destroy_frac=destroy_frac, t0=t0, t_min=t_min, alpha=alpha,
+        verbose=verbose,
+    )
+    if restarts <= 1:
+        return _lns_run(seed=seed, **kwargs)[0]
+
+    workers = min(restarts, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        runs = list(ex.map(lambda s: _lns_run(seed=s, **kwargs), range(seed, seed + restarts)))
+
+    return min(runs, key=lambda run: run[1])[0]
+
+
+def _lns_run(
+    *,
+    customers: List[int],
+    masks: np.ndarray,
+    cust_routes: Dict[int, np.ndarray],
+    costs: List[float],
+    initial_selected: List[int],
+    max_iters: int,
+    destroy_frac: float,
+    seed: int,
+    t0: float,
+    t_min: float,
+    alpha: float,
+    verbose: bool,
+) -> Tuple[List[int], float]:
+    """One LNS run of _lns_scp_improve; returns (selected indices, cost)."""
     import random
 
     rnd = random.Random(seed)
 
-    all_customers = set(customers)
+    all_customers = _pack_customers(customers, masks.shape[1])
+    costs_arr = np.asarray(costs, dtype=np.float64)
     best = set(initial_selected)
     best_cost = sum(costs[r] for r in best)
 
     current = set(best)
-
-    num_routes = len(route_cust)
+    current_cost = best_cost
+    temp = t0
 
     for it in range(max_iters):
         if not current:
@@ -190,54 +437,44 @@ def _lns_scp_improve(
         removed = set(rnd.sample(list(current), k))
         partial = current - removed
 
-        covered = set()
-        for r in partial:
-            covered |= route_cust[r]
-
-        uncovered = all_customers - covered
+        # one gather + OR-reduce over the surviving routes' masks
+        covered = np.bitwise_or.reduce(
+            masks[np.fromiter(partial, dtype=np.int64, count=len(partial))],
+            axis=0, initial=np.uint64(0),
+        )
+        uncovered = all_customers & ~covered
 
         # -----------------------------
         # REPAIR (greedy SCP)
         # -----------------------------
-        while uncovered:
-            best_r = None
-            best_score = float("inf")
-
-            for r in range(num_routes):
-                if r in partial:
-                    continue
-                newly = uncovered & route_cust[r]
-                if not newly:
-                    continue
-
-                score = costs[r] / len(newly)
-                if score < best_score:
-                    best_score = score
-                    best_r = r
-
-            if best_r is None:
-                break
+        cand = _candidates(cust_routes, uncovered, masks.shape[0])
 
+        for best_r, _, _ in _greedy_picks(masks, cust_routes, costs_arr, uncovered, cand):
             partial.add(best_r)
-            covered |= route_cust[best_r]
-            uncovered = all_customers - covered
 
         new_cost = sum(costs[r] for r in partial)
 
         # -----------------------------
         # ACCEPTANCE
         # -----------------------------
+        annealing = t0 > 0.0 and temp >= t_min
+
         if new_cost < best_cost:
-            best = set(partial)
-            best_cost = new_cost
-            current = set(partial)
+            best = current = partial
+            best_cost = current_cost = new_cost
 
             if verbose:
                 print(f"[SCP-LNS] iter={it} improved cost={best_cost:.2f}")
-        else:
-            current = set(best)
+        elif not annealing:
+            current = best
+            current_cost = best_cost
+        elif new_cost < current_cost or rnd.random() < math.exp((current_cost - new_cost) / temp):
+            current = partial
+            current_cost = new_cost
+
+        temp *= alpha
 
-    return sorted(best)
+    return sorted(best), best_cost
 
 
 def solve_scp(
@@ -245,7 +482,11 @@ def solve_scp(
     route_pool: List[List[int]],
     time_limit: Optional[float] = None,
     verbose: bool = True,
-    seed: int = 0
+    seed: int = 0,
+    lns_restarts: int = 1,
+    lns_t0: float = 0.0,
+    warm_start: bool = False,
+    prefer_mip_below: int = 200,
 ) -> Dict[str, object]:
     """
     Solve the LP relaxation of the route-based Set Covering Problem (SCP) with Gurobi,
@@ -261,15 +502,30 @@ def solve_scp(
         Time limit in seconds for Gurobi LP solve. If None, no explicit limit.
     verbose : bool
         If True, print a short log of the model and rounding progress.
+    seed : int
+        Seed of the LNS improvement phase.
+    lns_restarts : int
+        Number of independent LNS runs (seeds seed, seed + 1, ...) executed
+        in parallel threads; the best one is returned.
+    lns_t0 : float
+        Initial simulated-annealing temperature of the LNS (in cost units,
+        cooled by 0.95 per iteration); 0 accepts improvements only.
+    warm_start : bool
+        If True, start the LP from a greedy cover (PStart/DStart).
+    prefer_mip_below : int
+        Reduced pools with fewer routes are solved directly as the binary
+        SCP (exact, typically well under a second at that size) instead of
+        LP + rounding + LNS; 0 always takes the LP path.
 
     Returns
     -------
     dict with keys:
         "solver"           : str
-        "optimal"          : bool (always False here: we do LP + heuristic rounding)
+        "optimal"          : bool (False for LP + heuristic rounding; True when
+                             the small-pool MIP path proved optimality)
         "status"           : Gurobi status code (int)
         "obj_value"        : objective value of selected integer cover (float or None)
-        "lp_obj_value"     : LP objective value (float or None)
+        "lp_obj_value"     : LP objective value (float or None; None on the MIP path)
         "selected_indices" : list[int] indices of chosen routes in route_pool
         "selected_routes"  : list[list[int]] of chosen VRPLIB routes
     """
@@ -288,18 +544,23 @@ def solve_scp(
         print(f"[SCP-LP] Route pool size: {len(route_pool)}")
 
     # --------------------------------------------------------------
-    # 2) Build coverage structure: which routes cover each customer
+    # 2) Route costs and SCP-safe pool reduction (duplicates and
+    #    routes dominated by a no more expensive superset)
     # --------------------------------------------------------------
-    route_cust: List[Set[int]] = []
-    for route in route_pool:
-        visited = {nid for nid in route if nid != 1}
-        route_cust.append(visited)
+    costs = _compute_route_costs(inst, route_pool)
+
+    # keep[j] = index in route_pool of reduced route j
+    keep = scp_kept_indices(route_pool, costs)
+    routes = [route_pool[i] for i in keep]
+    costs = [costs[i] for i in keep]
+
+    if verbose and len(routes) < len(route_pool):
+        print(f"[SCP-LP] Dominance-reduced pool: {len(routes)}")
 
-    cust_routes: Dict[int, List[int]] = {i: [] for i in customers}
-    for r_idx, visited in enumerate(route_cust):
-        for i in visited:
-            if i in cust_routes:
-                cust_routes[i].append(r_idx)
+    # --------------------------------------------------------------
+    # 3) Build coverage structure: which routes cover each customer
+    # --------------------------------------------------------------
+    masks, cust_routes, A = _coverage_index(routes, dim)
 
     uncovered = [i for i, rlist in cust_routes.items() if len(rlist) == 0]
     if uncovered:
@@ -308,40 +569,48 @@ def solve_scp(
         )
 
     # --------------------------------------------------------------
-    # 3) Route costs
+    # 4) Build Gurobi LP model (binary SCP for small pools)
     # --------------------------------------------------------------
-    costs = _compute_route_costs(inst, route_pool)
+    num_routes = len(routes)
+    use_mip = num_routes < prefer_mip_below
 
-    # --------------------------------------------------------------
-    # 4) Build Gurobi LP model
-    # --------------------------------------------------------------
-    model = Model("route_scp_lp")
+    model = Model("route_scp_mip" if use_mip else "route_scp_lp")
 
     model.Params.OutputFlag = 1 if verbose else 0
     if time_limit is not None:
         model.Params.TimeLimit = float(time_limit)
+    if use_mip:
+        model.Params.MIPGap = 1e-9
 
-    num_routes = len(route_pool)
-
-    # LP relaxation: 0 <= x_r <= 1, continuous
-    x = model.addVars(
+    # LP relaxation: 0 <= x_r <= 1, continuous (binary on the MIP path)
+    x = model.addMVar(
         num_routes,
         lb=0.0,
         ub=1.0,
-        vtype=GRB.CONTINUOUS,
+        vtype=GRB.BINARY if use_mip else GRB.CONTINUOUS,
         name="x",
     )
 
-    model.setObjective(
-        quicksum(costs[r] * x[r] for r in range(num_routes)),
-        GRB.MINIMIZE,
-    )
+    model.setObjective(np.asarray(costs, dtype=np.float64) @ x, GRB.MINIMIZE)
+
+    # Cover constraints as one sparse matrix block (row k = customer k + 2)
+    cover = model.addMConstr(A, x, ">", np.ones(len(customers)), name="cover")
 
-    for i in customers:
-        model.addConstr(
-            quicksum(x[r] for r in cust_routes[i]) >= 1.0,
-            name=f"cover_{i}",
+    # Warm start: a plain greedy cover (no LP guidance) as the primal start,
+    # zero duals; LPWarmStart=2 keeps the start usable through presolve
+    if warm_start and not use_mip:
+        greedy = _greedy_rounding(
+            customers=customers,
+            masks=masks,
+            cust_routes=cust_routes,
+            costs=costs,
+            x_vals=np.zeros(num_routes),
         )
+        start = np.zeros(num_routes)
+        start[greedy] = 1.0
+        x.PStart = start
+        cover.DStart = np.zeros(len(customers))
+        model.Params.LPWarmStart = 2
 
     # --------------------------------------------------------------
     # 5) Solve LP
@@ -376,16 +645,32 @@ def solve_scp(
             "selected_routes": [],
         }
 
+    if use_mip:
+        selected_indices = [keep[r] for r in np.flatnonzero(x.X > 0.5).tolist()]
+        obj_value = float(model.objVal)
+
+        if verbose:
+            print(f"[SCP-LP] Small pool, solved as MIP: status {status}, objective {obj_value}")
+
+        return {
+            "solver": "gurobi_lp",
+            "optimal": status == GRB.OPTIMAL,
+            "status": status,
+            "obj_value": obj_value,
+            "lp_obj_value": None,
+            "selected_indices": selected_indices,
+            "selected_routes": [route_pool[r] for r in selected_indices],
+        }
+
     lp_obj_value = float(model.objVal)
 
     # Extract LP solution values
-    x_attr = model.getAttr("X", x)  # dict-like: {idx: value}
-    x_vals: Dict[int, float] = {r: float(x_attr[r]) for r in range(num_routes)}
+    x_vals = x.X
 
     if verbose:
         # Basic LP diagnostics
-        frac = sum(1 for v in x_vals.values() if 1e-6 < v < 1.0 - 1e-6)
-        ones = sum(1 for v in x_vals.values() if v >= 1.0 - 1e-6)
+        frac = int(np.count_nonzero((x_vals > 1e-6) & (x_vals < 1.0 - 1e-6)))
+        ones = int(np.count_nonzero(x_vals >= 1.0 - 1e-6))
         print(f"[SCP-LP] LP status    : {status}")
         print(f"[SCP-LP] LP objective : {lp_obj_value}")
         print(f"[SCP-LP] LP vars: ~1 => {ones}, fractional => {frac}, total => {num_routes}")
@@ -395,7 +680,8 @@ def solve_scp(
     # --------------------------------------------------------------
     selected_indices = _greedy_rounding(
         customers=customers,
-        route_cust=route_cust,
+        masks=masks,
+        cust_routes=cust_routes,
         costs=costs,
         x_vals=x_vals,
         verbose=verbose,
@@ -407,20 +693,24 @@ def solve_scp(
     # --------------------------------------------------------------
     selected_indices = _lns_scp_improve(
         customers=customers,
-        route_cust=route_cust,
+        masks=masks,
+        cust_routes=cust_routes,
         costs=costs,
         initial_selected=selected_indices,
         max_iters=20,
         destroy_frac=0.3,
         seed=seed,
+        restarts=lns_restarts,
+        t0=lns_t0,
         verbose=verbose,
     )
 
-    selected_routes = [route_pool[r] for r in selected_indices]
-
     # Compute integer objective value for returned solution
     obj_value = float(sum(costs[r] for r in selected_indices))
 
+    selected_indices = [keep[r] for r in selected_indices]
+    selected_routes = [route_pool[r] for r in selected_indices]
+
     if verbose:
         print(f"[SCP-LP] Rounded objective : {obj_value}")
         print(f"[SCP-LP] Routes used        : {len(selected_indices)} / {num_routes}")
@@ -19,11 +19,14 @@ This is the SCP layer that will later be used in the DRSCI framework.
 
 from __future__ import annotations
 
-import math
-from typing import List, Dict, Optional
+from itertools import chain
+from typing import Any, List, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import scipy.sparse as sp
 
 try:
-    from gurobipy import Model, GRB, quicksum
+    from gurobipy import Column, Constr, Model, GRB, LinExpr, Var
 except ImportError as e:
     raise ImportError(
         "gurobipy is required for SCP solving. "
@@ -33,42 +36,65 @@ except ImportError as e:
     ) from e
 
 from master.utils.loader import load_instance
+from master.setcover.gurobi_tuning import configure_gurobi, gurobi_env
+from master.setcover.route_costs import compute_route_costs, matrix_route_costs
 
 
 def _compute_route_costs(instance: dict,
-                         routes: List[List[int]]) -> List[float]:
+                         routes: List[List[int]],
+                         dist_matrix=None) -> List[float]:
     """
-    Compute Euclidean route costs based on node coordinates in the instance.
+    Compute route costs from the instance's edge weights (or node
+    coordinates if it has none). If a precomputed distance matrix is
+    given, edges are looked up there instead.
 
     VRPLIB convention:
         - instance["node_coord"][0] = coordinates of node 1 (depot)
         - routes are given as node IDs, e.g. [1, 5, 23, 1]
     """
-    coords = instance["node_coord"]  # shape (n, 2), index 0 -> node 1
+    if dist_matrix is not None:
+        return matrix_route_costs(dist_matrix, routes)
+    return compute_route_costs(instance, routes)
+
+
+def _coverage_matrix(routes: Sequence[List[int]], dim: int) -> sp.csr_matrix:
+    """
+    Sparse (customers x routes) 0/1 matrix, row k = customer k + 2.
+
+    The pool is flattened once into one contiguous int32 node array
+    instead of a Python set per route; the (customer, route) pairs, sorted
+    by customer, are the CSR rows directly. Node IDs outside 2..dim are
+    ignored; a customer visited twice by a route counts once.
+    """
+    n_routes = len(routes)
+    lengths = np.fromiter(map(len, routes), dtype=np.int64, count=n_routes)
+    flat = np.fromiter(chain.from_iterable(routes), dtype=np.int32, count=int(lengths.sum()))
+    route_of = np.repeat(np.arange(n_routes, dtype=np.int64), lengths)
 
-    def dist(u: int, v: int) -> float:
-        x1, y1 = coords[u - 1]
-        x2, y2 = coords[v - 1]
-        return math.hypot(x2 - x1, y2 - y1)
+    valid = (flat >= 2) & (flat <= dim)
+    rows, cols = flat[valid] - 2, route_of[valid]
 
-    costs: List[float] = []
-    for route in routes:
-        if len(route) < 2:
-            costs.append(0.0)
-            continue
-        c = 0.0
-        for u, v in zip(route, route[1:]):
-            c += dist(u, v)
-        costs.append(c)
+    # stable sort by customer keeps the routes ascending within each row;
+    # then drop repeats of a customer inside one route
+    order = np.argsort(rows, kind="stable")
+    rows, cols = rows[order], cols[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    rows, cols = rows[first], cols[first]
 
-    return costs
+    indptr = np.searchsorted(rows, np.arange(dim))
+    return sp.csr_matrix((np.ones(len(cols)), cols, indptr), shape=(dim - 1, n_routes))
 
 
 def solve_scp(
     instance_name: str,
-    route_pool: List[List[int]],
+    route_pool: Optional[Sequence[List[int]]],
     time_limit: Optional[float] = None,
     verbose: bool = True,
+    dist_matrix=None,
+    *,
+    pool: Optional[Any] = None,
+    gurobi_params: Optional[Mapping[str, Any]] = None,
 ) -> Dict[str, object]:
     """
     Solve the route-based Set Covering Problem (SCP) with Gurobi.
@@ -83,6 +109,16 @@ def solve_scp(
         Time limit in seconds for Gurobi. If None, no explicit limit.
     verbose : bool
         If True, print a short log of the model and solution.
+    dist_matrix : np.ndarray, optional
+        Precomputed (n x n) distance matrix (row 0 = depot). If given,
+        route costs are gathered from it instead of recomputed from coords.
+    pool : RoutePoolManager, optional
+        Pool with an attached instance. If given, its routes, customers,
+        coverage and cached costs are used and route_pool is ignored
+        (no instance load, no cost recomputation).
+    gurobi_params : mapping, optional
+        Extra Gurobi parameters, e.g. gurobi_tuning.PRESETS["scp"].
+        If None, Gurobi defaults are kept.
 
     Returns
     -------
@@ -92,15 +128,22 @@ def solve_scp(
         "selected_indices" : list[int] indices of chosen routes in route_pool
         "selected_routes"  : list[list[int]] of chosen VRPLIB routes
     """
+    if pool is not None:
+        route_pool = pool.routes_view()
+
     if not route_pool:
         raise ValueError("Route pool is empty: cannot solve SCP.")
 
     # --------------------------------------------------------------
     # 1) Load instance and basic info
     # --------------------------------------------------------------
-    inst = load_instance(instance_name)
-    dim = int(inst["dimension"])
-    customers = list(range(2, dim + 1))  # customer node IDs (depot = 1)
+    if pool is not None:
+        customers = pool.customers
+        dim = len(customers) + 1
+    else:
+        inst = load_instance(instance_name)
+        dim = int(inst["dimension"])
+        customers = list(range(2, dim + 1))  # customer node IDs (depot = 1)
 
     if verbose:
         print(f"[SCP] Instance: {instance_name}, DIMENSION={dim}")
@@ -109,21 +152,15 @@ def solve_scp(
     # --------------------------------------------------------------
     # 2) Build coverage structure: which routes cover each customer
     # --------------------------------------------------------------
-    # route_cust[r] = set of customers contained in route r
-    route_cust = []
-    for r_idx, route in enumerate(route_pool):
-        visited = {nid for nid in route if nid != 1}
-        route_cust.append(visited)
-
-    # cust_routes[i] = list of route indices that visit customer i
-    cust_routes: Dict[int, List[int]] = {i: [] for i in customers}
-    for r_idx, visited in enumerate(route_cust):
-        for i in visited:
-            if i in cust_routes:   # ignore if some node outside 2..dim appears
-                cust_routes[i].append(r_idx)
+    # A[k, r] = 1 iff route r visits customer k + 2
+    if pool is not None:
+        # the pool keeps its (routes x customers) coverage as CSR already
+        A = pool.coverage_csr().T.tocsr()
+    else:
+        A = _coverage_matrix(route_pool, dim)
 
     # Sanity check: make sure each customer is covered at least once
-    uncovered = [i for i, rlist in cust_routes.items() if len(rlist) == 0]
+    uncovered = [customers[k] for k in np.flatnonzero(np.diff(A.indptr) == 0)]
     if uncovered:
         # This is a critical issue for DRSCI: some customers never appear in the route pool.
         # For now, raise an error so we catch it early.
@@ -134,12 +171,15 @@ def solve_scp(
     # --------------------------------------------------------------
     # 3) Route costs
     # --------------------------------------------------------------
-    costs = _compute_route_costs(inst, route_pool)
+    if pool is not None:
+        costs = pool.costs
+    else:
+        costs = _compute_route_costs(inst, route_pool, dist_matrix)
 
     # --------------------------------------------------------------
     # 4) Build Gurobi model
     # --------------------------------------------------------------
-    model = Model("route_scp")
+    model = Model("route_scp", env=gurobi_env())
 
     # Control Gurobi output level
     model.Params.OutputFlag = 1 if verbose else 0
@@ -147,23 +187,18 @@ def solve_scp(
     if time_limit is not None:
         model.Params.TimeLimit = float(time_limit)
 
+    configure_gurobi(model, gurobi_params)
+
     # Decision vars: x_r ∈ {0,1} for each route r
     num_routes = len(route_pool)
-    x = model.addVars(num_routes, vtype=GRB.BINARY, name="x")
+    x = model.addMVar(num_routes, vtype=GRB.BINARY, name="x")
 
     # Objective: minimize sum_r c_r * x_r
-    model.setObjective(
-        quicksum(costs[r] * x[r] for r in range(num_routes)),
-        GRB.MINIMIZE,
-    )
+    model.setObjective(np.asarray(costs, dtype=np.float64) @ x, GRB.MINIMIZE)
 
     # Coverage constraints: each customer must be visited by at least one selected route
-    for i in customers:
-        routes_covering_i = cust_routes[i]
-        model.addConstr(
-            quicksum(x[r] for r in routes_covering_i) >= 1,
-            name=f"cover_{i}",
-        )
+    # (row k of A is customer k + 2, submitted as a single matrix constraint)
+    model.addMConstr(A, x, ">", np.ones(len(customers)), name="cover")
 
     # --------------------------------------------------------------
     # 5) Solve
@@ -196,10 +231,7 @@ def solve_scp(
     # --------------------------------------------------------------
     selected_indices: List[int] = []
     if model.SolCount > 0:
-        model_sol = model.getAttr("X", x)
-        for r_idx in range(num_routes):
-            if model_sol[r_idx] > 0.5:
-                selected_indices.append(r_idx)
+        selected_indices = np.flatnonzero(x.X > 0.5).tolist()
 
     selected_routes = [route_pool[r] for r in selected_indices]
 
@@ -218,6 +250,108 @@ def solve_scp(
     }
 
 
+class IncrementalSCP:
+    """
+    Persistent SCP model that only grows by columns.
+
+    Within DRSCI the covering problem changes between iterations only by
+    new routes. Instead of rebuilding the model each time, new routes are
+    added as columns to the existing cover rows, so Gurobi keeps its
+    presolve/LP state and the previous selection is used as a MIP start.
+
+    Usage:
+        scp = IncrementalSCP(instance_name)
+        scp.extend(routes)               # any number of times
+        res = scp.solve(time_limit=60)   # same schema as solve_scp()
+    """
+
+    SOLVER = "gurobi"
+    SENSE = GRB.GREATER_EQUAL   # IncrementalRSP switches to GRB.EQUAL
+    ROW_NAME = "cover"
+
+    def __init__(
+        self,
+        instance_name: str,
+        *,
+        verbose: bool = False,
+        depot_id: int = 1,
+        gurobi_params: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self._inst = load_instance(instance_name)
+        self._depot_id = depot_id
+        dim = int(self._inst["dimension"])
+
+        model = Model(f"route_{self.ROW_NAME}_incremental", env=gurobi_env())
+        model.Params.OutputFlag = 1 if verbose else 0
+        configure_gurobi(model, gurobi_params)
+        model.ModelSense = GRB.MINIMIZE
+
+        # one (initially empty) row per customer; columns fill them in
+        self._constrs: Dict[int, Constr] = {
+            i: model.addLConstr(LinExpr(), self.SENSE, 1.0, name=f"{self.ROW_NAME}_{i}")
+            for i in range(2, dim + 1)
+        }
+        self._model = model
+        self._x: List[Var] = []
+        self._routes: List[List[int]] = []
+        self._selected: List[int] = []
+
+    @property
+    def routes(self) -> List[List[int]]:
+        return self._routes
+
+    def extend(self, routes: Sequence[List[int]], costs: Optional[Sequence[float]] = None) -> None:
+        """Add routes as new columns (costs computed from the instance if None)."""
+        if not routes:
+            return
+        if costs is None:
+            costs = compute_route_costs(self._inst, routes)
+
+        constrs = self._constrs
+        add_var = self._model.addVar
+        for route, cost in zip(routes, costs):
+            rows = [constrs[i] for i in {n for n in route if n != self._depot_id} if i in constrs]
+            self._x.append(
+                add_var(obj=cost, vtype=GRB.BINARY, column=Column([1.0] * len(rows), rows))
+            )
+        self._routes.extend(routes)
+
+    def solve(self, time_limit: Optional[float] = None) -> Dict[str, object]:
+        model = self._model
+        model.Params.TimeLimit = float(time_limit) if time_limit is not None else GRB.INFINITY
+
+        # previous selection as a (partial) MIP start for the grown model;
+        # Gurobi keeps Start values between solves, so every variable is
+        # set (older selections back to undefined), not just the new ones
+        if self._selected:
+            start = np.full(len(self._x), GRB.UNDEFINED)
+            start[self._selected] = 1.0
+            model.setAttr("Start", self._x, start.tolist())
+
+        model.optimize()
+
+        status = model.Status
+        if model.SolCount == 0:
+            return {
+                "solver": self.SOLVER,
+                "optimal": False,
+                "status": status,
+                "obj_value": None,
+                "selected_indices": [],
+                "selected_routes": [],
+            }
+
+        sol = np.asarray(model.getAttr("X", self._x))
+        self._selected = np.flatnonzero(sol > 0.5).tolist()
+        return {
+            "solver": self.SOLVER,
+            "optimal": status == GRB.OPTIMAL,
+            "status": status,
+            "obj_value": float(model.ObjVal),
+            "selected_indices": list(self._selected),
+            "selected_routes": [self._routes[r] for r in self._selected],
+        }
+
 
 if __name__ == "__main__":
     # This is only a minimal internal check; you can ignore or adapt it.
@@ -21,8 +21,7 @@ Lives next to:
 
 from __future__ import annotations
 
-import math
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 try:
     import hexaly.optimizer
@@ -33,35 +32,9 @@ except ImportError as e:
         "You also need a working Hexaly Optimizer installation + license."
     ) from e
 
-from master.utils.loader import load_instance
-
-
-def _compute_route_costs_int(instance: dict, routes: List[List[int]]) -> List[int]:
-    """
-    Compute integer-rounded Euclidean route costs based on node coordinates.
-
-    VRPLIB convention:
-        - instance["node_coord"][0] = coordinates of node 1 (depot)
-        - routes are node IDs, e.g. [1, 5, 23, 1]
-    """
-    coords = instance["node_coord"]  # index 0 -> node 1
-
-    def dist_int(u: int, v: int) -> int:
-        x1, y1 = coords[u - 1]
-        x2, y2 = coords[v - 1]
-        return int(round(math.hypot(x2 - x1, y2 - y1)))
-
-    costs: List[int] = []
-    for route in routes:
-        if len(route) < 2:
-            costs.append(0)
-            continue
-        c = 0
-        for u, v in zip(route, route[1:]):
-            c += dist_int(u, v)
-        costs.append(c)
-
-    return costs
+from master.utils.loader import coords_array, load_instance
+from master.setcover.route_costs import euclidean_route_costs
+from master.setcover.route_dominance_filter import scp_kept_indices
 
 
 def solve_scp(
@@ -96,18 +69,36 @@ def solve_scp(
         print(f"[SCP-HX] Route pool size: {len(route_pool)}")
 
     # --------------------------------------------------------------
-    # 2) Build coverage structure
+    # 2) Route costs (integer-rounded like your pipeline) and
+    #    SCP-safe pool reduction
+    # --------------------------------------------------------------
+    costs = euclidean_route_costs(coords_array(inst), route_pool, round_edges=True)
+
+    # keep[j] = index in route_pool of reduced route j
+    keep = scp_kept_indices(route_pool, costs)
+    routes = [route_pool[i] for i in keep]
+    costs = [costs[i] for i in keep]
+    num_routes = len(routes)
+
+    if verbose and num_routes < len(route_pool):
+        print(f"[SCP-HX] Dominance-reduced pool: {num_routes}")
+
+    # --------------------------------------------------------------
+    # 3) Build coverage structure
     # --------------------------------------------------------------
     route_cust: List[Set[int]] = []
-    for route in route_pool:
+    for route in routes:
         visited = {nid for nid in route if nid != 1}
         route_cust.append(visited)
 
-    cust_routes: Dict[int, List[int]] = {i: [] for i in customers}
+    cust_lists: Dict[int, List[int]] = {i: [] for i in customers}
     for r_idx, visited in enumerate(route_cust):
         for i in visited:
-            if i in cust_routes:
-                cust_routes[i].append(r_idx)
+            if i in cust_lists:
+                cust_lists[i].append(r_idx)
+
+    # frozen once: only read from here on
+    cust_routes: Dict[int, Tuple[int, ...]] = {i: tuple(rl) for i, rl in cust_lists.items()}
 
     uncovered = [i for i, rlist in cust_routes.items() if len(rlist) == 0]
     if uncovered:
@@ -115,12 +106,6 @@ def solve_scp(
             f"[SCP-HX] These customers are NOT covered by any route in the pool: {uncovered}"
         )
 
-    # --------------------------------------------------------------
-    # 3) Route costs (integer-rounded like your pipeline)
-    # --------------------------------------------------------------
-    costs = _compute_route_costs_int(inst, route_pool)
-    num_routes = len(route_pool)
-
     # --------------------------------------------------------------
     # 4) Build + solve Hexaly model
     # --------------------------------------------------------------
@@ -131,11 +116,13 @@ def solve_scp(
         # (Hexaly typically supports model.bool() for a boolean decision var.)
         x = [m.bool() for _ in range(num_routes)]
 
-        # Coverage constraints: for each customer i, sum_{r covers i} x[r] >= 1
-        for i in customers:
-            rlist = cust_routes[i]
-            # IMPORTANT: pass a list into m.sum (not a generator)
-            m.constraint(m.sum([x[r] for r in rlist]) >= 1)
+        # Coverage constraints: for each customer i, sum_{r covers i} x[r] >= 1.
+        # The Hexaly Python API has no matrix/batch constraint builder, so
+        # all row sums are built in one pass, then posted.
+        # IMPORTANT: pass a list into m.sum (not a generator)
+        row_exprs = [m.sum([x[r] for r in cust_routes[i]]) for i in customers]
+        for expr in row_exprs:
+            m.constraint(expr >= 1)
 
         # Objective: minimize total cost
         # IMPORTANT: build terms as a list (not a generator)
@@ -173,6 +160,7 @@ def solve_scp(
                 # If no value available, treat as not selected
                 pass
 
+        selected_indices = [keep[r] for r in selected_indices]
         selected_routes = [route_pool[r] for r in selected_indices]
 
         # Objective value (best-effort across Hexaly versions)
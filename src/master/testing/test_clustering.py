@@ -1,9 +1,9 @@
 import os, sys
 
 # Ensure module paths
-CURRENT_DIR = os.path.dirname(__file__)
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
-    sys.path.append(CURRENT_DIR)
+    sys.path.insert(0, CURRENT_DIR)
 
 # ---- Custom clustering imports ----
 from clustering.k_medoids import k_medoids
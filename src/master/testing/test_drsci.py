@@ -19,9 +19,11 @@ DRSCI loop:
 import sys
 import os
 import time
+import logging
 import math
 import random
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # ---------------------------------------------------------
 # sys.path setup
@@ -42,11 +44,12 @@ from master.improve.ls_controller import improve_with_local_search
 from master.setcover.duplicate_removal import remove_duplicates
 from master.clustering.route_based import route_based_decomposition
 from master.utils.loader import load_instance
+from master.utils.helpers_run_probabilistic import _result_to_vrplib_routes
 
 
 def lazy_import_scp():
-    from master.setcover.scp_solver_gurobi_MIP import solve_scp
-    return solve_scp
+    from master.setcover.scp_solver_gurobi_MIP import IncrementalSCP
+    return IncrementalSCP
 
 
 # ---------------------------------------------------------
@@ -59,16 +62,15 @@ VB_CLUSTER_METHODS = [
     "sk_ac_avg",
     "sk_kmeans",
     "fcm",
-    "pyclust_k_medoids",
+    "k_medoids_pyclustering",
     "sk_ac_complete",
     "sk_ac_min",
 ]
 
 SEED = 0
-random.seed(SEED)
+_rng = random.Random(SEED)
 
 # Routing and LS parameters
-TIME_LIMIT_PER_CLUSTER = 40.0          # increased due to cluster size ~250
 LS_NEIGHBOURHOOD = "dri_spatial"
 MAX_NEIGHBOURS_LS = 40
 
@@ -84,25 +86,63 @@ FIXED_C = 2
 # ========================   HELPER FUNCTIONS   ========================
 # =====================================================================
 
+_KMAX_RE = re.compile(r'-k(\d+)')
+
+
+logger = logging.getLogger("drsci.test")
+
+
+class _DeferredFlushHandler(logging.StreamHandler):
+    """
+    StreamHandler that leaves flushing to the caller instead of flushing
+    after every record.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def setup_stdout_logger() -> logging.Handler:
+    """
+    Sends this driver's progress lines to sys.stdout, sharing its buffer
+    with the output the solvers print, so lines stay in order and piped
+    output is written in blocks. The caller flushes the returned handler
+    once per iteration. Calling it again reuses the existing handler.
+    """
+    for handler in logger.handlers:
+        if isinstance(handler, _DeferredFlushHandler):
+            return handler
+
+    handler = _DeferredFlushHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return handler
+
+
 def extract_kmax_from_filename(filename: str):
     """
     Extracts Kmax (#vehicles) from VRPLIB filename pattern '-kXX'.
     """
-    match = re.search(r'-k(\d+)', filename)
+    match = _KMAX_RE.search(filename)
     if not match:
         raise ValueError(f"No '-kXX' part found in filename: {filename}")
     return int(match.group(1))
 
 
-def deduplicate_routes(route_pool):
-    seen = set()
-    unique = []
-    for r in route_pool:
-        tup = tuple(r)
-        if tup not in seen:
-            seen.add(tup)
-            unique.append(r)
-    return unique
+def choose_decomposition(has_best: bool):
+    """
+    Draws the decomposition of one iteration: None for route-based,
+    otherwise the vertex-based clustering method.
+    """
+    if has_best and _rng.random() >= PROB_VERTEX_BASED:
+        return None
+    return _rng.choice(VB_CLUSTER_METHODS)
 
 
 # =====================================================================
@@ -110,19 +150,20 @@ def deduplicate_routes(route_pool):
 # =====================================================================
 
 def main():
-    solve_scp = lazy_import_scp()
+    IncrementalSCP = lazy_import_scp()
+    log_handler = setup_stdout_logger()
 
-    print(f"\n=== DRSCI-STYLE ITERATIVE RUN on {INSTANCE} ===")
+    logger.info("\n=== DRSCI-STYLE ITERATIVE RUN on %s ===", INSTANCE)
 
     # ---------------------------------------------------------
     # Step 1: Try reading K_MAX from filename
     # ---------------------------------------------------------
     try:
         K_MAX_filename = extract_kmax_from_filename(INSTANCE)
-        print(f"K_MAX extracted from filename: {K_MAX_filename}")
+        logger.info("K_MAX extracted from filename: %s", K_MAX_filename)
     except ValueError:
         K_MAX_filename = None
-        print("Filename does not contain -kXX.")
+        logger.info("Filename does not contain -kXX.")
 
     # ---------------------------------------------------------
     # Step 2: Load instance and compute N, q, total demand
@@ -139,9 +180,9 @@ def main():
     N = len(demands) - 1
     total_demand = sum(demands[i] for i in demands if i != 0)
 
-    print(f"Number of customers N: {N}")
-    print(f"Vehicle capacity q   : {q}")
-    print(f"Total demand         : {total_demand}")
+    logger.info("Number of customers N: %s", N)
+    logger.info("Vehicle capacity q   : %s", q)
+    logger.info("Total demand         : %s", total_demand)
 
     # If filename gave us K_MAX, use it; otherwise fallback
     if K_MAX_filename is not None:
@@ -149,29 +190,46 @@ def main():
     else:
         K_MAX = math.ceil(total_demand / q)
 
-    print(f"Using K_MAX = {K_MAX}")
+    logger.info("Using K_MAX = %s", K_MAX)
 
     # ---------------------------------------------------------
     # Step 3: DRSCI global runtime limit = 10 * N
     # ---------------------------------------------------------
     TOTAL_TIME_LIMIT = 10.0 * N
-    print(f"Total runtime limit (10*N): {TOTAL_TIME_LIMIT:.1f}s\n")
+    logger.info("Total runtime limit (10*N): %.1fs\n", TOTAL_TIME_LIMIT)
 
     # ---------------------------------------------------------
     # FIXED cluster size per iteration
     # ---------------------------------------------------------
-    print(f"Using FIXED number of clusters per iteration: |C| = {FIXED_C}")
-    print("This avoids huge clusters and SCP failures.\n")
+    logger.info("Using FIXED number of clusters per iteration: |C| = %s", FIXED_C)
+    logger.info("This avoids huge clusters and SCP failures.\n")
 
     # ---------------------------------------------------------
     # DRSCI state
     # ---------------------------------------------------------
-    global_route_pool = []
+    # The pool only grows, so the SCP model persists across iterations: new
+    # routes become new columns and the last selection is the MIP start.
+    # scp_model.routes is the global route pool.
+    scp_model = IncrementalSCP(INSTANCE, verbose=False)
+    scp = None  # last SCP result
+    last_ls = None  # (SCP selection, repaired, LS cost, LS routes) of the last LS run
+    seen_routes = set()  # tuple(route) of every route already in the pool
     best_routes = None
     best_cost = float("inf")
     no_improve = 0
     iteration = 0
 
+    # The next iteration's decomposition is drawn right after routing. A
+    # vertex-based clustering depends only on INSTANCE and |C|, so it runs
+    # in the background while this iteration's SCP, repair and LS run.
+    prefetch = ThreadPoolExecutor(max_workers=1)
+    planned = None  # (method or None for route-based, clustering future or None)
+
+    # One routing worker pool for the whole run instead of one per
+    # solve_clusters call
+    n_cpus = os.cpu_count() or 1
+    routing_pool = ProcessPoolExecutor(max_workers=n_cpus) if n_cpus > 1 else None
+
     start_time = time.time()
 
     # ---------------------------------------------------------
@@ -180,26 +238,34 @@ def main():
     while True:
         elapsed = time.time() - start_time
         if elapsed >= TOTAL_TIME_LIMIT:
-            print("\n[STOP] Global time limit reached.")
+            logger.info("\n[STOP] Global time limit reached.")
             break
         if no_improve >= MAX_NO_IMPROVE:
-            print("\n[STOP] No improvement for too long.")
+            logger.info("\n[STOP] No improvement for too long.")
             break
 
         iteration += 1
-        print("\n" + "=" * 70)
-        print(f"=== Iteration {iteration} ===")
-        print("=" * 70)
+        logger.info("\n%s", "=" * 70)
+        logger.info("=== Iteration %d ===", iteration)
+        logger.info("%s", "=" * 70)
 
         current_K = FIXED_C
-        print(f"[Iter {iteration}] Using |C| = {current_K}")
+        logger.info("[Iter %d] Using |C| = %s", iteration, current_K)
 
         # -----------------------------------------------------
         # Step 1: Choose decomposition type
         # -----------------------------------------------------
-        if best_routes is not None and random.random() >= PROB_VERTEX_BASED:
+        if planned is None:
+            method, future = choose_decomposition(best_routes is not None), None
+        else:
+            (method, future), planned = planned, None
+        if method is None and best_routes is None:
+            # planned as route-based, but no incumbent to decompose yet
+            method = _rng.choice(VB_CLUSTER_METHODS)
+
+        if method is None:
             # ROUTE-BASED
-            print(f"[Iter {iteration}] Decomposition: ROUTE-BASED")
+            logger.info("[Iter %d] Decomposition: ROUTE-BASED", iteration)
 
             clusters = route_based_decomposition(
                 instance_name=INSTANCE,
@@ -209,10 +275,13 @@ def main():
                 use_angle=True,
                 use_load=True,
             )
+        elif future is not None:
+            # VERTEX-BASED, clustered in the background last iteration
+            logger.info("[Iter %d] Decomposition: VERTEX-BASED (%s, prefetched)", iteration, method)
+            clusters, medoids = future.result()
         else:
             # VERTEX-BASED
-            method = random.choice(VB_CLUSTER_METHODS)
-            print(f"[Iter {iteration}] Decomposition: VERTEX-BASED ({method})")
+            logger.info("[Iter %d] Decomposition: VERTEX-BASED (%s)", iteration, method)
 
             clusters, medoids = run_clustering(
                 method,
@@ -222,79 +291,102 @@ def main():
 
         # stats
         total_assigned = sum(len(members) for members in clusters.values())
-        print(f"[Iter {iteration}] #clusters={len(clusters)}, customers assigned={total_assigned}")
+        logger.info("[Iter %d] #clusters=%s, customers assigned=%s", iteration, len(clusters), total_assigned)
 
         # -----------------------------------------------------
         # Step 2: Solve each cluster via PyVRP
         # -----------------------------------------------------
-        print(f"\n[Iter {iteration}] Stage 2: Routing subproblems")
+        logger.info("\n[Iter %d] Stage 2: Routing subproblems", iteration)
 
         routing = solve_clusters_with_pyvrp(
             instance_name=INSTANCE,
             clusters=clusters,
-            time_limit_per_cluster=TIME_LIMIT_PER_CLUSTER,
             seed=SEED,
+            executor=routing_pool,
         )
 
-        routes = routing["routes"]
-        print(f"[Iter {iteration}] Cluster routes total: {len(routes)}")
-        print(f"[Iter {iteration}] Cluster routing cost: {routing['total_cost']}")
+        # solve_clusters returns a pyvrp Result (per-cluster time limits are
+        # adaptive to the cluster size)
+        routes = _result_to_vrplib_routes(routing)
+        logger.info("[Iter %d] Cluster routes total: %s", iteration, len(routes))
+        logger.info("[Iter %d] Cluster routing cost: %s", iteration, sum(routing.cluster_costs.values()))
+
+        # plan the next iteration now (there is an incumbent after this one)
+        next_method = choose_decomposition(True)
+        next_future = None
+        if next_method is not None:
+            next_future = prefetch.submit(run_clustering, next_method, INSTANCE, FIXED_C)
+        planned = (next_method, next_future)
 
         # -----------------------------------------------------
         # Step 3: Add to global route pool
         # -----------------------------------------------------
-        global_route_pool.extend(routes)
-        global_route_pool = deduplicate_routes(global_route_pool)
-        print(f"[Iter {iteration}] Global route pool size = {len(global_route_pool)}")
+        # only the new routes are hashed, not the whole pool again
+        new_routes = []
+        for r in routes:
+            key = tuple(r)
+            if key not in seen_routes:
+                seen_routes.add(key)
+                new_routes.append(r)
+        scp_model.extend(new_routes)
+        logger.info("[Iter %d] Global route pool size = %s", iteration, len(scp_model.routes))
 
         # -----------------------------------------------------
         # Step 4: SCP on pooled routes
         # -----------------------------------------------------
-        print(f"\n[Iter {iteration}] Stage 3: SCP")
+        logger.info("\n[Iter %d] Stage 3: SCP", iteration)
 
-        scp = solve_scp(
-            instance_name=INSTANCE,
-            route_pool=global_route_pool,
-            time_limit=600,
-            verbose=False,
-        )
+        if not new_routes and scp is not None and scp["optimal"]:
+            # same columns as last time and that solve was proven optimal
+            logger.info("[Iter %d] Pool unchanged, reusing last SCP solution", iteration)
+        else:
+            scp = scp_model.solve(time_limit=600)
         selected = scp["selected_routes"]
-        print(f"[Iter {iteration}] SCP selected {len(selected)} routes")
-
-        # -----------------------------------------------------
-        # Step 5: Duplicate removal + LS repair
-        # -----------------------------------------------------
-        print(f"\n[Iter {iteration}] Stage 4: Duplicate removal + LS repair")
-
-        repaired = remove_duplicates(
-            instance_name=INSTANCE,
-            routes=selected,
-            verbose=False,
-            max_iters=50,
-            ls_neighbourhood=LS_NEIGHBOURHOOD,
-            ls_max_neighbours_restricted=MAX_NEIGHBOURS_LS,
-            seed=SEED,
-        )["routes"]
+        logger.info("[Iter %d] SCP selected %s routes", iteration, len(selected))
 
-        print(f"[Iter {iteration}] Repaired routes: {len(repaired)}")
+        # Repair and LS are seeded, so the same selection (same routes in
+        # the same order) always gives the same result: reuse the last one.
+        selected_sig = tuple(map(tuple, selected))
 
-        # -----------------------------------------------------
-        # Step 6: Global LS
-        # -----------------------------------------------------
-        print(f"\n[Iter {iteration}] Stage 5: Global LS")
+        if last_ls is not None and last_ls[0] == selected_sig:
+            _, repaired, improved_cost, improved_routes = last_ls
+            logger.info("[Iter %d] SCP selection seen before, reusing repair + LS results", iteration)
+        else:
+            # -----------------------------------------------------
+            # Step 5: Duplicate removal + LS repair
+            # -----------------------------------------------------
+            logger.info("\n[Iter %d] Stage 4: Duplicate removal + LS repair", iteration)
 
-        ls_res = improve_with_local_search(
-            instance_name=INSTANCE,
-            routes_vrplib=repaired,
-            neighbourhood=LS_NEIGHBOURHOOD,
-            max_neighbours=MAX_NEIGHBOURS_LS,
-            seed=SEED,
-        )
+            repaired = remove_duplicates(
+                instance_name=INSTANCE,
+                routes=selected,
+                verbose=False,
+                max_iters=50,
+                ls_neighbourhood=LS_NEIGHBOURHOOD,
+                ls_max_neighbours_restricted=MAX_NEIGHBOURS_LS,
+                seed=SEED,
+            )["routes"]
+
+            logger.info("[Iter %d] Repaired routes: %s", iteration, len(repaired))
+
+            # -----------------------------------------------------
+            # Step 6: Global LS
+            # -----------------------------------------------------
+            logger.info("\n[Iter %d] Stage 5: Global LS", iteration)
+
+            ls_res = improve_with_local_search(
+                instance_name=INSTANCE,
+                routes_vrplib=repaired,
+                neighbourhood=LS_NEIGHBOURHOOD,
+                max_neighbours=MAX_NEIGHBOURS_LS,
+                seed=SEED,
+            )
 
-        improved_cost = ls_res["improved_cost"]
-        improved_routes = ls_res["routes_improved"]
+            improved_cost = ls_res["improved_cost"]
+            improved_routes = ls_res["routes_improved"]
+            last_ls = (selected_sig, repaired, improved_cost, improved_routes)
 
-        print(f"[Iter {iteration}] LS improved cost: {improved_cost}")
+        logger.info("[Iter %d] LS improved cost: %s", iteration, improved_cost)
 
         # -----------------------------------------------------
         # Step 7: Update best solution
@@ -306,32 +398,38 @@ def main():
             no_improve = 0
 
             if delta is None:
-                print(f"[Iter {iteration}] New best solution = {best_cost}")
+                logger.info("[Iter %d] New best solution = %s", iteration, best_cost)
             else:
-                print(f"[Iter {iteration}] Improved by {delta:.2f}, new best = {best_cost}")
+                logger.info("[Iter %d] Improved by %.2f, new best = %s", iteration, delta, best_cost)
         else:
             no_improve += 1
-            print(f"[Iter {iteration}] No improvement ({no_improve}/{MAX_NO_IMPROVE})")
+            logger.info("[Iter %d] No improvement (%s/%s)", iteration, no_improve, MAX_NO_IMPROVE)
+
+        logger.info("[Iter %d] Current best: %s, routes=%s", iteration, best_cost, len(best_routes) if best_routes else 0)
+        logger.info("[Iter %d] Time elapsed: %.1fs\n", iteration, time.time()-start_time)
+        log_handler.flush()
 
-        print(f"[Iter {iteration}] Current best: {best_cost}, routes={len(best_routes) if best_routes else 0}")
-        print(f"[Iter {iteration}] Time elapsed: {time.time()-start_time:.1f}s\n")
+    prefetch.shutdown(wait=False, cancel_futures=True)
+    if routing_pool is not None:
+        routing_pool.shutdown(cancel_futures=True)
 
     # ---------------------------------------------------------
     # FINAL OUTPUT
     # ---------------------------------------------------------
-    print("\n" + "=" * 70)
-    print("=== FINAL SUMMARY ===")
-    print("=" * 70)
+    logger.info("\n%s", "=" * 70)
+    logger.info("=== FINAL SUMMARY ===")
+    logger.info("%s", "=" * 70)
 
     if best_routes is None:
-        print("No feasible solution found.")
+        logger.info("No feasible solution found.")
     else:
-        print(f"Best cost   : {best_cost}")
-        print(f"Route count : {len(best_routes)}")
+        logger.info("Best cost   : %s", best_cost)
+        logger.info("Route count : %s", len(best_routes))
         for r in best_routes:
-            print(" ", r)
+            logger.info("  %s", r)
 
-    print("\n=== END ===")
+    logger.info("\n=== END ===")
+    log_handler.flush()
 
 
 if __name__ == "__main__":
@@ -5,8 +5,12 @@ import math
 import os
 import random
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, FrozenSet
 from collections import Counter
+from functools import lru_cache
+
+from master.setcover.route_costs import euclidean_route_costs, matrix_route_costs
+from master.utils.loader import coords_array, rounded_edge_weights
 
 # ---------------------------------------------------------
 # Paths
@@ -20,7 +24,7 @@ PROJECT_ROOT = _HELPERS_DIR.parents[2]
 Route = List[int]
 Routes = List[Route]
 
-RouteKey = Tuple[int, ...]
+RouteKey = FrozenSet[int]
 Tag = Dict[str, Any]
 
 # ============================================================
@@ -31,9 +35,12 @@ def _route_key(route: Route, *, depot_id: int = 1) -> RouteKey:
     """
     Canonical key for tagging:
     - remove depot visits
-    - keep order (do NOT sort)
+    - ignore order (same customer set = same route identity, matching
+      the route dominance filter)
+    The set is built from the whole route in C and the depot dropped
+    afterwards, wherever it occurs (no per-node Python comparison).
     """
-    return tuple(n for n in route if n != depot_id)
+    return frozenset(route).difference((depot_id,))
 
 
 def _tag_new_routes(
@@ -45,13 +52,33 @@ def _tag_new_routes(
 ) -> None:
     """
     Attach tag to each route if it doesn't already have one.
-    We use setdefault so we preserve the first-known origin for that exact route.
+    Only the first-known origin for a customer set is kept; the visiting
+    order of that first route is stored under "customers_ordered".
     """
     for r in routes:
         key = _route_key(r, depot_id=depot_id)
         if not key:
             continue
-        route_tags.setdefault(key, dict(tag))
+        if key not in route_tags:
+            route_tags[key] = {
+                **tag,
+                "customers_ordered": tuple(n for n in r if n != depot_id),
+            }
+
+
+def _add_to_pool(
+    pool_by_key: Dict[RouteKey, Route],
+    routes: Routes,
+    *,
+    depot_id: int = 1,
+) -> None:
+    """
+    Add routes to a pool keyed by customer set, keeping the first route
+    seen for each set (what filter_route_pool does without costs), so
+    only the new routes are hashed instead of re-filtering the pool.
+    """
+    for r in routes:
+        pool_by_key.setdefault(_route_key(r, depot_id=depot_id), r)
 
 
 def _result_to_vrplib_routes(result) -> Routes:
@@ -68,23 +95,44 @@ def _result_to_vrplib_routes(result) -> Routes:
     return routes
 
 
+# id(instance) -> (instance, {route tuple: integer cost}); only the last
+# instance is kept, and holding it keeps its id from being reused
+_ROUTE_COST_CACHE: Dict[int, Tuple[dict, Dict[Tuple[int, ...], int]]] = {}
+# Routes memoized before the cache is dropped and refilled from scratch
+_ROUTE_COST_CACHE_MAX = 200_000
+
+
+def _integer_route_costs(instance: dict, routes: Routes) -> List[int]:
+    if instance.get("edge_weight") is not None:
+        return matrix_route_costs(rounded_edge_weights(instance), routes, round_edges=True)
+    return euclidean_route_costs(coords_array(instance), routes, round_edges=True)
+
+
 def _compute_integer_cost(instance: dict, routes: Routes) -> int:
-    coords = instance["node_coord"]
-    edge_mat = instance.get("edge_weight")
-
-    def dist(u: int, v: int) -> int:
-        u_idx, v_idx = u - 1, v - 1
-        if edge_mat is not None:
-            return int(round(float(edge_mat[u_idx, v_idx])))
-        dx = coords[u_idx][0] - coords[v_idx][0]
-        dy = coords[u_idx][1] - coords[v_idx][1]
-        return int(round((dx * dx + dy * dy) ** 0.5))
-
-    total = 0
-    for r in routes:
-        for a, b in zip(r, r[1:]):
-            total += dist(a, b)
-    return total
+    """
+    Total cost with every edge rounded to the nearest integer (VRPLIB
+    convention), from the edge_weight matrix when present, else coords.
+
+    Route costs are memoized per instance by visiting order (costs are
+    deterministic), so only routes not seen before are computed, all in
+    one NumPy pass. The memo is cleared once it would exceed
+    _ROUTE_COST_CACHE_MAX routes.
+    """
+    cached = _ROUTE_COST_CACHE.get(id(instance))
+    if cached is None:
+        _ROUTE_COST_CACHE.clear()
+        cached = _ROUTE_COST_CACHE[id(instance)] = (instance, {})
+    costs = cached[1]
+
+    keys = list(map(tuple, routes))
+    missing = [r for r, key in zip(routes, keys) if key not in costs]
+    if len(costs) + len(missing) > _ROUTE_COST_CACHE_MAX:
+        costs.clear()
+        missing = routes
+    if missing:
+        costs.update(zip(map(tuple, missing), _integer_route_costs(instance, missing)))
+
+    return sum(costs[key] for key in keys)
 
 
 def _select_scp_solver_name(rng: random.Random, scp_solvers: List[str], scp_switch_prob: float) -> str:
@@ -95,6 +143,22 @@ def _select_scp_solver_name(rng: random.Random, scp_solvers: List[str], scp_swit
     return scp_solvers[0]
 
 
+_BKS_FILE = PROJECT_ROOT / "instances" / "challenge-instances" / "challenge-bks.json"
+
+
+@lru_cache(maxsize=1)
+def _load_bks_dict(mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parsed challenge-bks.json. Keyed by the file's mtime, so the file is
+    parsed once per run (and again only if it changes on disk).
+    """
+    try:
+        with open(_BKS_FILE, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {}
+
+
 def _load_bks_from_file(instance_name: str) -> Optional[int]:
     """
     Load BKS (Best Known Solution) cost for an instance from bks.json file.
@@ -105,17 +169,12 @@ def _load_bks_from_file(instance_name: str) -> Optional[int]:
     Returns:
         BKS cost as int if found, None otherwise
     """
-    # Get the path to bks.json file
-    # CURRENT is src/master, so we go up to core, then instances/test-instances
-    bks_file = PROJECT_ROOT / "instances" / "challenge-instances" / "challenge-bks.json"
-    
-    if not bks_file.exists():
+    try:
+        bks_data = _load_bks_dict(_BKS_FILE.stat().st_mtime_ns)
+    except FileNotFoundError:
         return None
-    
+
     try:
-        with open(bks_file, "r") as f:
-            bks_data = json.load(f)
-        
         instance_stem = Path(instance_name).stem
         bks_cost = bks_data.get(instance_stem)
         
@@ -124,7 +183,7 @@ def _load_bks_from_file(instance_name: str) -> Optional[int]:
             return None
         
         return int(bks_cost)
-    except (json.JSONDecodeError, KeyError, ValueError, FileNotFoundError):
+    except (KeyError, ValueError):
         return None
 
 
@@ -165,6 +224,19 @@ def _convert_customer_ids_for_output(customers: List[int]) -> List[int]:
     return [c - 1 for c in customers]
 
 
+def _format_sol_routes(routes: Routes) -> str:
+    """
+    "Route #k: ..." lines of the official checker format (depot dropped,
+    customer ids shifted from 2..n to 1..n-1, as in
+    _convert_customer_ids_for_output), filtered and shifted in one pass
+    per route and joined into a single write.
+    """
+    return "".join(
+        f"Route #{idx}: " + " ".join([str(v - 1) for v in r if v != 1]) + "\n"
+        for idx, r in enumerate(routes, start=1)
+    )
+
+
 def _write_sol_if_bks_beaten(
     *,
     instance_name: str,
@@ -193,16 +265,7 @@ def _write_sol_if_bks_beaten(
 
     # Official checker format: depot not mentioned, customers from 1 to n-1
     with open(sol_path, "w") as f:
-        for idx, r in enumerate(routes, start=1):
-            # Remove depot (assumes VRPLIB format [1, ..., 1])
-            customers_vrplib = [v for v in r if v != 1]
-            # Convert to official checker format (1 to n-1)
-            customers = _convert_customer_ids_for_output(customers_vrplib)
-
-            f.write(
-                f"Route #{idx}: " + " ".join(map(str, customers)) + "\n"
-            )
-
+        f.write(_format_sol_routes(routes))
         f.write(f"Cost: {cost}\n")
 
     instance_base = Path(instance_name).stem
@@ -232,10 +295,7 @@ def _write_sol_unconditional(
     sol_path = Path(output_dir) / f"{base}_{suffix}_{cost}.sol"
 
     with open(sol_path, "w") as f:
-        for idx, r in enumerate(routes, start=1):
-            customers_vrplib = [v for v in r if v != 1]
-            customers = _convert_customer_ids_for_output(customers_vrplib)
-            f.write(f"Route #{idx}: " + " ".join(map(str, customers)) + "\n")
+        f.write(_format_sol_routes(routes))
         f.write(f"Cost: {cost}\n")
 
     print(
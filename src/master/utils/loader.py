@@ -2,15 +2,116 @@
 
 import os
 import vrplib
-from typing import Any, Dict
+from vrplib.parse.parse_distances import parse_distances
+from typing import Any, Dict, Tuple
 from functools import lru_cache
 
+import numpy as np
+
+
+def _freeze(instance: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mark all array fields read-only. The cached dict is shared by every
+    caller, so an accidental in-place write would corrupt later solves.
+    """
+    for value in instance.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return instance
+
+
+def coords_array(instance: Dict[str, Any]) -> np.ndarray:
+    """
+    Node coordinates as a contiguous (n, 2) float64 array, row 0 = depot.
+
+    vrplib stores node_coord as int64 for integer-coordinate instances;
+    load_instance keeps a float copy next to it so distance code does not
+    convert on every call. Other dicts are converted on the fly.
+    """
+    coords = instance.get("_coords_np")
+    if coords is None:
+        coords = np.ascontiguousarray(instance["node_coord"], dtype=np.float64)
+    return coords
+
+
+def _save_atomic(path: str, save) -> None:
+    # write under a private name first: parallel workers may load the same
+    # instance, and a reader must never see a half-written cache file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        save(f)
+    os.replace(tmp, path)
+
+
+def _read_instance_cached(p: str) -> Dict[str, Any]:
+    """
+    vrplib.read_instance with a parsed side cache next to the .vrp file:
+    <p>.npz holds the parsed fields (0-d arrays for scalars), as small as
+    the .vrp itself. It is used only if it is not older than the .vrp
+    file; if it cannot be written (read-only location), the instance is
+    just parsed.
+
+    Computed edge weights are never cached (n^2 floats: hundreds of MB at
+    XL size); like vrplib, they are rebuilt from the parsed fields unless
+    the file has an explicit EDGE_WEIGHT_SECTION.
+    """
+    cache_path = p + ".npz"
+
+    instance = None
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(p):
+            with np.load(cache_path, allow_pickle=False) as data:
+                instance = {
+                    k: data[k].item() if data[k].ndim == 0 else data[k]
+                    for k in data.files
+                }
+    except (OSError, ValueError):
+        instance = None
+
+    if instance is None:
+        instance = vrplib.read_instance(p, compute_edge_weights=False)
+        try:
+            _save_atomic(cache_path, lambda f: np.savez(f, **instance))
+        except OSError:
+            pass
+
+    if instance and "edge_weight" not in instance:
+        instance["edge_weight"] = parse_distances([], **instance)
+
+    return instance
+
+
+# Single-entry cache of the rounded edge matrix of the last instance used:
+#   instance name -> (source edge_weight, rounded int32 matrix)
+_EDGE_INT32_CACHE: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def rounded_edge_weights(instance: Dict[str, Any]) -> np.ndarray:
+    """
+    The edge_weight matrix rounded to the nearest integer (VRPLIB
+    convention) as read-only int32. Kept for the last instance only, so
+    rounding happens once per instance instead of on every edge lookup
+    without pinning an n^2 copy per cached instance.
+    """
+    source = instance["edge_weight"]
+    cached = _EDGE_INT32_CACHE.get(instance.get("name"))
+    # the source array is kept too: a same-named dict must not alias
+    if cached is not None and cached[0] is source:
+        return cached[1]
+
+    edge = np.rint(source).astype(np.int32)
+    edge.setflags(write=False)
+    _EDGE_INT32_CACHE.clear()
+    _EDGE_INT32_CACHE[instance.get("name")] = (source, edge)
+    return edge
+
 
-@lru_cache(maxsize=32)
 def load_instance(instance_name: str) -> Dict[str, Any]:
     """
     Loads a CVRP instance using vrplib and returns its data dictionary.
-    Caches up to 32 recently used instances in memory for fast reuse.
+    Caches up to 32 recently used instances in memory for fast reuse;
+    the returned arrays are shared and read-only. Parsed instances are
+    also cached on disk next to the .vrp file (see _read_instance_cached).
 
     Automatically searches for the instance in:
         core/instances/test-instances/x
@@ -21,12 +122,16 @@ def load_instance(instance_name: str) -> Dict[str, Any]:
         instance_name: Either a full path to the instance file, or just the filename.
                       If a full path is provided, only the basename will be used for searching.
     """
+    # Only the file name is searched for, so it is also the cache key: a
+    # bare name and a full path share one cache entry
+    return _load_by_filename(os.path.basename(instance_name))
+
+
+@lru_cache(maxsize=32)
+def _load_by_filename(instance_filename: str) -> Dict[str, Any]:
     base_dir = os.path.dirname(__file__)
     core_root = os.path.abspath(os.path.join(base_dir, "../../../"))
 
-    # Extract just the filename from instance_name (in case a full path is provided)
-    instance_filename = os.path.basename(instance_name)
-
     # Define all search locations (order matters!)
     search_paths = [
         os.path.join(core_root, "instances", "test-instances", "x"),
@@ -37,7 +142,10 @@ def load_instance(instance_name: str) -> Dict[str, Any]:
     for path in search_paths:
         p = os.path.join(path, instance_filename)
         if os.path.exists(p):
-            return vrplib.read_instance(p)
+            instance = _read_instance_cached(p)
+            if "node_coord" in instance:
+                instance["_coords_np"] = coords_array(instance)
+            return _freeze(instance)
 
     raise FileNotFoundError(
         f"Instance '{instance_filename}' not found in any of:\n  "